@@ -0,0 +1,38 @@
+"""Shared helpers for the Foxtrot PLC benchmarks."""
+
+from __future__ import annotations
+
+import sys
+import time
+import types
+from pathlib import Path
+
+INTEGRATION_DIR = (
+    Path(__file__).resolve().parent.parent
+    / "custom_components"
+    / "foxtrot_plc"
+)
+
+
+def load_integration() -> None:
+    """Make the integration modules importable as ``foxtrot_plc.*``.
+
+    The package ``__init__`` sets up Home Assistant entries, which the
+    protocol-level benchmarks do not need, so the package is registered
+    without executing it and submodules are imported on demand.
+    """
+    if "foxtrot_plc" in sys.modules:
+        return
+    package = types.ModuleType("foxtrot_plc")
+    package.__path__ = [str(INTEGRATION_DIR)]
+    sys.modules["foxtrot_plc"] = package
+
+
+def best_of(func, repeat: int = 5) -> float:
+    """Return the fastest wall time of several runs of func, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
@@ -0,0 +1,112 @@
+"""Micro-benchmark of the PLCComS response parser.
+
+Parses a 10k-line LIST: response through the previous path (readline(),
+decode(), strip() and partition() per line) and through ResponseParser
+on 64 KiB chunks, and reports wall time and the traced memory peak on
+top of the parsed result, i.e. the short-lived allocations of parsing.
+
+    python benchmarks/bench_parser.py [--lines 10000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tracemalloc
+
+from _common import best_of, load_integration
+
+load_integration()
+
+from foxtrot_plc.parser import CHUNK_SIZE, ResponseParser  # noqa: E402
+
+PLC_TYPES = ("BOOL", "INT", "REAL", "STRING")
+
+
+def make_list_response(lines: int) -> bytes:
+    """Return a LIST: response with the given number of variables."""
+    body = "".join(
+        f"LIST:MAIN.GRP{index % 50:02d}.VAR{index}_{PLC_TYPES[index % 4]},"
+        f"{PLC_TYPES[index % 4]}\n"
+        for index in range(lines)
+    )
+    return f"{body}LIST:\n".encode()
+
+
+def stream_reader(payload: bytes) -> asyncio.StreamReader:
+    """Return a stream reader that already holds the whole payload."""
+    reader = asyncio.StreamReader(limit=2**20)
+    reader.feed_data(payload)
+    reader.feed_eof()
+    return reader
+
+
+async def parse_readline(payload: bytes) -> dict:
+    """Parse the payload the way the client did before ResponseParser."""
+    reader = stream_reader(payload)
+    variables = {}
+    while line := await reader.readline():
+        response = line.decode().strip()
+        if response == "LIST:":
+            break
+        if response.startswith("LIST:"):
+            response = response[5:]
+        if response:
+            name, _, plc_type = response.partition(",")
+            variables[name] = plc_type.strip()
+    return variables
+
+
+async def parse_chunks(payload: bytes) -> dict:
+    """Parse the payload with ResponseParser on large chunks."""
+    reader = stream_reader(payload)
+    parser = ResponseParser()
+    variables = {}
+    while chunk := await reader.read(CHUNK_SIZE):
+        for keyword, name, value in parser.feed(chunk):
+            if keyword == "LIST" and name:
+                variables[name] = value or ""
+    return variables
+
+
+def measure(parse, payload: bytes) -> dict:
+    """Return time and allocation figures of one parser."""
+    loop = asyncio.new_event_loop()
+    try:
+        expected = loop.run_until_complete(parse(payload))
+        seconds = best_of(lambda: loop.run_until_complete(parse(payload)))
+
+        tracemalloc.start()
+        result = loop.run_until_complete(parse(payload))
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        loop.close()
+    assert result == expected
+    return {"seconds": seconds, "transient": peak - retained, "result": result}
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=10000)
+    args = parser.parse_args()
+
+    payload = make_list_response(args.lines)
+    old = measure(parse_readline, payload)
+    new = measure(parse_chunks, payload)
+    assert old["result"] == new["result"], "parsers disagree"
+
+    print(f"LIST: response with {args.lines} lines, {len(payload)} bytes")
+    print(f"{'parser':>10} {'ms':>9} {'us/line':>9} {'transient KiB':>14}")
+    for label, result in (("readline", old), ("chunked", new)):
+        print(
+            f"{label:>10} {result['seconds'] * 1000:>9.2f} "
+            f"{result['seconds'] / args.lines * 1e6:>9.3f} "
+            f"{result['transient'] / 1024:>14.1f}"
+        )
+    print(f"speed-up: {old['seconds'] / new['seconds']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
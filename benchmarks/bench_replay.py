@@ -0,0 +1,229 @@
+"""Coordinator benchmark against a replayed PLCComS session.
+
+Plays a capture recorded with the foxtrot_plc.start_recording service
+back through replay_server.py in a separate process, so its CPU time is
+not counted, and drives FoxtrotPLCCoordinator against it with one
+listener per variable standing in for the entities. Reports the refresh
+cost and how many entity updates per second the coordinator delivers.
+
+Without a capture, one is first recorded from the simulator with a few
+percent of the values changing, which also exercises the recorder. With
+--subscription the recorded session subscribes, so the capture holds the
+DIFF: pushes to stream.
+Requires Home Assistant to be installed.
+
+    python benchmarks/bench_replay.py [capture.jsonl.gz] [--speed 0] \
+        [--refreshes 50]
+    python benchmarks/bench_replay.py capture.jsonl.gz --subscription \
+        --duration 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from _common import load_integration
+from plccoms_simulator import PLCComsSimulator
+from replay_server import Capture
+
+load_integration()
+
+from foxtrot_plc.coordinator import FoxtrotPLCCoordinator  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+REPLAY_SERVER = Path(__file__).resolve().parent / "replay_server.py"
+
+
+def make_coordinator(hass: HomeAssistant, port: int, subscription: bool):
+    """Return a coordinator for a local server."""
+    return FoxtrotPLCCoordinator(
+        hass,
+        "127.0.0.1",
+        port,
+        "",
+        "",
+        30,
+        False,
+        "warning",
+        False,
+        subscription_mode=subscription,
+    )
+
+
+async def record_capture(
+    hass: HomeAssistant, path: str, variables: int, subscription: bool
+) -> None:
+    """Record a polled or subscribed session against the simulator."""
+    simulator = PLCComsSimulator(variables, change_rate=0.05, tick=0.1)
+    port = await simulator.start()
+    coordinator = make_coordinator(hass, port, subscription)
+    try:
+        await coordinator.async_start_recording(path)
+        if subscription:
+            await coordinator.async_refresh()  # Subscribes
+            await asyncio.sleep(3)
+        else:
+            for _ in range(30):
+                await coordinator.async_refresh()
+                await asyncio.sleep(0.1)
+    finally:
+        await coordinator.async_shutdown()
+        await simulator.stop()
+
+
+async def start_replay(capture: str, speed: float):
+    """Start the replay server process and return it with its port."""
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        str(REPLAY_SERVER),
+        capture,
+        "--port",
+        "0",
+        "--speed",
+        str(speed),
+        "--loop",
+        stdout=asyncio.subprocess.PIPE,
+    )
+    banner = (await process.stdout.readline()).decode()
+    print(banner.strip())
+    return process, int(banner.rsplit(":", 1)[1])
+
+
+def add_listeners(coordinator: FoxtrotPLCCoordinator, counter: list) -> None:
+    """Count the updates of one listener per variable."""
+
+    def update() -> None:
+        counter[0] += 1
+
+    for variable in coordinator.data:
+        coordinator.async_add_listener(update, variable)
+
+
+async def bench_polling(coordinator, refreshes: int) -> dict:
+    """Time refreshes and count the entity updates they cause."""
+    await coordinator.async_refresh()  # Loads the catalog, warms up
+    if not coordinator.last_update_success:
+        raise RuntimeError(
+            f"Warm-up refresh failed: {coordinator.last_exception}"
+        )
+    updates = [0]
+    add_listeners(coordinator, updates)
+
+    durations = []
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    for _ in range(refreshes):
+        start = time.perf_counter()
+        await coordinator.async_refresh()
+        durations.append(time.perf_counter() - start)
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    variables = len(coordinator.data)
+    return {
+        "variables": variables,
+        "polls/s": refreshes / wall,
+        "p50 ms": statistics.median(durations) * 1000,
+        "max ms": max(durations) * 1000,
+        "CPU us/var": cpu / (refreshes * max(1, variables)) * 1e6,
+        "updates/s": updates[0] / wall,
+    }
+
+
+async def bench_subscription(coordinator, duration: float) -> dict:
+    """Count the entity updates DIFF: pushes cause over a period."""
+    await coordinator.async_refresh()
+    if not coordinator.last_update_success:
+        raise RuntimeError(
+            f"Warm-up refresh failed: {coordinator.last_exception}"
+        )
+    updates = [0]
+    add_listeners(coordinator, updates)
+
+    diffs = coordinator.client.metrics.diffs_received
+    cpu_start = time.process_time()
+    await asyncio.sleep(duration)
+    cpu = time.process_time() - cpu_start
+    diffs = coordinator.client.metrics.diffs_received - diffs
+    return {
+        "variables": len(coordinator.data),
+        "pushes/s": diffs / duration,
+        "updates/s": updates[0] / duration,
+        "CPU %": cpu / duration * 100,
+    }
+
+
+async def run(args) -> None:
+    """Record a capture if needed, replay it and run the benchmark."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        capture = args.capture
+        if capture is None:
+            capture = os.path.join(config_dir, "capture.jsonl.gz")
+            await record_capture(
+                hass, capture, args.variables, args.subscription
+            )
+            print(
+                f"Recorded {os.path.getsize(capture)} bytes from the simulator"
+            )
+        if (
+            args.subscription
+            and not args.speed
+            and not any(pushed for *_, pushed in Capture(capture).events)
+        ):
+            # As fast as possible, only recorded pushes are streamed
+            raise SystemExit(
+                f"{capture} holds no DIFF: pushes to replay with --speed 0"
+            )
+
+        process, port = await start_replay(capture, args.speed)
+        coordinator = make_coordinator(hass, port, args.subscription)
+        try:
+            if args.subscription:
+                result = await bench_subscription(coordinator, args.duration)
+            else:
+                result = await bench_polling(coordinator, args.refreshes)
+        finally:
+            await coordinator.async_shutdown()
+            process.terminate()
+            await process.wait()
+
+        print(" ".join(f"{label:>11}" for label in result))
+        print(
+            " ".join(
+                f"{value:>11}" if isinstance(value, int) else f"{value:>11.2f}"
+                for value in result.values()
+            )
+        )
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("capture", nargs="?")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=0,
+        help="replay speed, 0 as fast as possible",
+    )
+    parser.add_argument("--refreshes", type=int, default=50)
+    parser.add_argument("--subscription", action="store_true")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument(
+        "--variables",
+        type=int,
+        default=2000,
+        help="size of a recorded capture",
+    )
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""End-to-end throughput benchmark for FoxtrotPLCCoordinator.
+
+Runs the PLCComS simulator in a separate process, so its CPU time is not
+counted, and times full coordinator refreshes (GET: of every variable,
+parsing and listener fan-out) for several catalog sizes. Reports polls
+per second, p50/p99 refresh latency and CPU time per variable.
+Requires Home Assistant to be installed.
+
+    python benchmarks/bench_throughput.py [--sizes 100 1000 10000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from _common import load_integration
+
+load_integration()
+
+from foxtrot_plc.coordinator import FoxtrotPLCCoordinator  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+SIMULATOR = Path(__file__).resolve().parent / "plccoms_simulator.py"
+
+
+async def start_simulator(variables: int, latency: float):
+    """Start the simulator process and return it with its port."""
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        str(SIMULATOR),
+        "--port",
+        "0",
+        "--variables",
+        str(variables),
+        "--change-rate",
+        "0",
+        "--latency",
+        str(latency),
+        stdout=asyncio.subprocess.PIPE,
+    )
+    banner = (await process.stdout.readline()).decode()
+    return process, int(banner.rsplit(":", 1)[1])
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Return the value at a fraction of the sorted values."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def bench_size(
+    hass: HomeAssistant, variables: int, refreshes: int, latency: float
+) -> dict:
+    """Time coordinator refreshes against a simulator of one size."""
+    process, port = await start_simulator(variables, latency)
+    coordinator = FoxtrotPLCCoordinator(
+        hass, "127.0.0.1", port, "", "", 30, False, "warning", False
+    )
+    try:
+        await coordinator.async_refresh()  # Loads the catalog, warms up
+        if not coordinator.last_update_success:
+            raise RuntimeError(
+                f"Warm-up refresh failed: {coordinator.last_exception}"
+            )
+
+        durations = []
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        for _ in range(refreshes):
+            start = time.perf_counter()
+            await coordinator.async_refresh()
+            durations.append(time.perf_counter() - start)
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+    finally:
+        await coordinator.async_shutdown()
+        process.terminate()
+        await process.wait()
+
+    return {
+        "variables": variables,
+        "polls_per_second": refreshes / wall,
+        "p50_ms": statistics.median(durations) * 1000,
+        "p99_ms": percentile(durations, 0.99) * 1000,
+        "cpu_us_per_variable": cpu / (refreshes * variables) * 1e6,
+    }
+
+
+async def run(args) -> None:
+    """Run the benchmark for every size."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        print(
+            f"{'variables':>10} {'polls/s':>9} {'p50 ms':>9} "
+            f"{'p99 ms':>9} {'CPU us/var':>11}"
+        )
+        for size in args.sizes:
+            result = await bench_size(hass, size, args.refreshes, args.latency)
+            print(
+                f"{result['variables']:>10} "
+                f"{result['polls_per_second']:>9.2f} "
+                f"{result['p50_ms']:>9.2f} {result['p99_ms']:>9.2f} "
+                f"{result['cpu_us_per_variable']:>11.2f}"
+            )
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[100, 1000, 10000]
+    )
+    parser.add_argument("--refreshes", type=int, default=20)
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="simulated response latency (s)",
+    )
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""Micro-benchmark of the coordinator value store.
+
+Compares the slot-indexed ValueStore with the previous approach of
+publishing a fresh dict on every refresh and diffing it against the
+last one. Reports the memory held by the published values, time and
+transient allocations of a refresh in which a share of the values
+changes, and the cost of every entity reading its value.
+
+    python benchmarks/bench_value_store.py [--variables 10000] [--changed 0.05]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tracemalloc
+
+from _common import best_of, load_integration
+
+load_integration()
+
+from foxtrot_plc.values import ValueStore  # noqa: E402
+
+
+def make_values(count: int, seed: int = 0) -> dict:
+    """Return values of mixed PLC types, as the decoders produce them."""
+    rng = random.Random(seed)
+    values = {}
+    for index in range(count):
+        kind = index % 4
+        name = f"MAIN.GRP{index % 50:02d}.VAR{index}"
+        if kind == 0:
+            values[name] = rng.random() < 0.5
+        elif kind == 1:
+            values[name] = rng.randint(-1000, 100000)
+        elif kind == 2:
+            values[name] = rng.uniform(-50, 50)
+        else:
+            values[name] = f"text{rng.randint(0, 99)}"
+    return values
+
+
+def change_values(values: dict, share: float, seed: int = 1) -> dict:
+    """Return a copy of values with a share of them changed."""
+    rng = random.Random(seed)
+    changed = dict(values)
+    for name in rng.sample(list(values), int(len(values) * share)):
+        value = values[name]
+        if isinstance(value, bool):
+            changed[name] = not value
+        elif isinstance(value, int):
+            changed[name] = value + 1
+        elif isinstance(value, float):
+            changed[name] = value + 0.5
+        else:
+            changed[name] = value + "x"
+    return changed
+
+
+def encode(values: dict) -> dict:
+    """Return the raw PLCComS strings of values."""
+    return {
+        name: (
+            ("1" if value else "0") if isinstance(value, bool) else str(value)
+        )
+        for name, value in values.items()
+    }
+
+
+def decode(raw: str):
+    """Decode a raw value like the typed decoders, by its look."""
+    if raw in ("0", "1"):
+        return raw == "1"
+    if raw.lstrip("-").isdigit():
+        return int(raw)
+    try:
+        return float(raw)
+    except ValueError:
+        return raw
+
+
+def refresh_dict(previous: dict, polled: dict) -> tuple[dict, set]:
+    """Publish a fresh dict and diff it against the previous one."""
+    data = {}
+    for name, raw in polled.items():
+        data[name] = decode(raw)
+    changed = {
+        name
+        for name, value in data.items()
+        if name not in previous or previous[name] != value
+    }
+    changed.update(name for name in previous if name not in data)
+    return data, changed
+
+
+def refresh_store(store: ValueStore, polled: dict) -> list:
+    """Update the store in place and collect the changed variables."""
+    for name, raw in polled.items():
+        store.set(name, decode(raw))
+    return store.pop_changed()
+
+
+def traced(func) -> tuple[int, int]:
+    """Return the retained and peak traced memory of a call, in bytes."""
+    tracemalloc.start()
+    result = func()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return retained, peak
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--variables", type=int, default=10000)
+    parser.add_argument("--changed", type=float, default=0.05)
+    args = parser.parse_args()
+
+    base = make_values(args.variables)
+    # Raw responses of two polls, decoded during the refresh like the
+    # coordinator does
+    polls = [
+        encode(change_values(base, args.changed, seed)) for seed in (1, 2)
+    ]
+    names = list(base)
+
+    # Memory held by the published values, including the decoded objects
+    dict_memory, _ = traced(lambda: refresh_dict({}, polls[0])[0])
+
+    def build_store():
+        store = ValueStore()
+        store.assign(names)
+        refresh_store(store, polls[0])
+        return store
+
+    store_memory, _ = traced(build_store)
+
+    # One refresh, alternating between two polls so values really change
+    previous = refresh_dict({}, polls[0])[0]
+    store = build_store()
+    state = {"index": 0, "previous": previous}
+
+    def dict_refresh():
+        state["index"] ^= 1
+        state["previous"], _ = refresh_dict(
+            state["previous"], polls[state["index"]]
+        )
+
+    def store_refresh():
+        state["index"] ^= 1
+        refresh_store(store, polls[state["index"]])
+
+    dict_seconds = best_of(dict_refresh, repeat=9)
+    store_seconds = best_of(store_refresh, repeat=9)
+    _, dict_peak = traced(lambda: refresh_dict(previous, polls[1]))
+    _, store_peak = traced(lambda: refresh_store(store, polls[1]))
+
+    # Every entity reading its value once
+    slots = [store.slot(name) for name in names]
+    published = state["previous"]
+    dict_read = best_of(
+        lambda: [published.get(name) for name in names], repeat=9
+    )
+    store_read = best_of(
+        lambda: [store.value_at(slot) for slot in slots], repeat=9
+    )
+
+    print(
+        f"{args.variables} variables, {args.changed:.0%} changed per refresh\n"
+        f"{'':>8} {'held KiB':>10} {'refresh ms':>11} "
+        f"{'refresh peak KiB':>17} {'reads ms':>9}"
+    )
+    for label, memory, seconds, peak, read in (
+        ("dict", dict_memory, dict_seconds, dict_peak, dict_read),
+        ("store", store_memory, store_seconds, store_peak, store_read),
+    ):
+        print(
+            f"{label:>8} {memory / 1024:>10.1f} {seconds * 1000:>11.2f} "
+            f"{peak / 1024:>17.1f} {read * 1000:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""Asyncio stand-in for a PLCComS server.
+
+Speaks the subset of the protocol the integration uses: LIST:, GET:,
+SET:, EN:, DI: and GETINFO:. The catalog size, value change rate,
+response latency and fault injection are configurable, so the client
+and coordinator can be exercised without a real Foxtrot.
+
+    python benchmarks/plccoms_simulator.py --variables 3000 --port 5010
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+
+PLC_TYPES = ("BOOL", "INT", "REAL", "STRING")
+
+
+class PLCComsSimulator:
+    """Simulated PLCComS server with a random variable catalog."""
+
+    def __init__(
+        self,
+        variables: int = 1000,
+        change_rate: float = 0.0,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        drop_rate: float = 0.0,
+        tick: float = 1.0,
+        seed: int = 0,
+    ) -> None:
+        """Initialize the simulator.
+
+        change_rate is the fraction of values changed every tick seconds,
+        latency delays every response without blocking later commands,
+        error_rate answers that fraction of GET: commands with ERROR: and
+        drop_rate closes the connection on that fraction of commands.
+        """
+        self.change_rate = change_rate
+        self.latency = latency
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.tick = tick
+        self._random = random.Random(seed)
+        self.types = {}
+        self.values = {}
+        for index in range(variables):
+            plc_type = PLC_TYPES[index % len(PLC_TYPES)]
+            name = f"MAIN.GRP{index % 50:02d}.VAR{index}_{plc_type}"
+            self.types[name] = plc_type
+            self.values[name] = self._random_value(plc_type)
+        self.commands = 0
+        self._subscribers = {}
+        self._server = None
+        self._ticker = None
+
+    def _random_value(self, plc_type: str) -> str:
+        """Return a random value of a PLC type in PLCComS notation."""
+        if plc_type == "BOOL":
+            return self._random.choice(("0", "1"))
+        if plc_type == "INT":
+            return str(self._random.randint(-1000, 1000))
+        if plc_type == "REAL":
+            return f"{self._random.uniform(-50, 50):.6f}"
+        return f"text{self._random.randint(0, 99)}"
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Start listening and return the bound port."""
+        self._server = await asyncio.start_server(
+            self._handle_client, host, port
+        )
+        if self.change_rate:
+            self._ticker = asyncio.get_running_loop().create_task(
+                self._run_ticker()
+            )
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """Stop the server and drop all clients."""
+        if self._ticker is not None:
+            self._ticker.cancel()
+        for writer in list(self._subscribers):
+            writer.close()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _run_ticker(self) -> None:
+        """Change a share of the values every tick and push DIFF: lines."""
+        names = list(self.values)
+        count = max(1, int(len(names) * self.change_rate))
+        while True:
+            await asyncio.sleep(self.tick)
+            for name in self._random.sample(names, count):
+                self.set_value(name, self._random_value(self.types[name]))
+
+    def set_value(self, name: str, value: str) -> None:
+        """Change a value and notify subscribers outside their delta."""
+        previous = self.values.get(name)
+        self.values[name] = value
+        for writer, subscriptions in list(self._subscribers.items()):
+            if name not in subscriptions:
+                continue
+            delta = subscriptions[name]
+            if delta and previous is not None:
+                try:
+                    if abs(float(value) - float(previous)) < delta:
+                        continue
+                except ValueError:
+                    pass
+            self._send(writer, f"DIFF:{name},{value}\n")
+
+    def _send(self, writer, text: str) -> None:
+        """Write a response, after the configured latency."""
+        if writer.is_closing():
+            return
+        if self.latency:
+            asyncio.get_running_loop().call_later(
+                self.latency, self._send_now, writer, text
+            )
+        else:
+            writer.write(text.encode())
+
+    @staticmethod
+    def _send_now(writer, text: str) -> None:
+        """Write a delayed response unless the client went away."""
+        if not writer.is_closing():
+            writer.write(text.encode())
+
+    async def _handle_client(self, reader, writer) -> None:
+        """Serve one PLCComS client."""
+        self._subscribers[writer] = {}
+        try:
+            while line := await reader.readline():
+                self.commands += 1
+                if self.drop_rate and self._random.random() < self.drop_rate:
+                    break
+                self._handle_command(writer, line.decode().strip())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._subscribers.pop(writer, None)
+            writer.close()
+
+    def _handle_command(self, writer, command: str) -> None:
+        """Answer a single command."""
+        keyword, _, argument = command.partition(":")
+        if keyword == "LIST":
+            lines = [
+                f"LIST:{name},{plc_type}\n"
+                for name, plc_type in self.types.items()
+            ]
+            lines.append("LIST:\n")
+            self._send(writer, "".join(lines))
+        elif keyword == "GET":
+            if argument not in self.values or (
+                self.error_rate and self._random.random() < self.error_rate
+            ):
+                self._send(writer, f"ERROR:GET {argument}\n")
+            else:
+                self._send(writer, f"GET:{argument},{self.values[argument]}\n")
+        elif keyword == "SET":
+            name, _, value = argument.partition(",")
+            if name in self.values:
+                self.set_value(name, value)
+            else:
+                self._send(writer, f"ERROR:SET {name}\n")
+        elif keyword == "EN":
+            subscriptions = self._subscribers[writer]
+            if not argument:
+                self._send(writer, f"EN:{len(subscriptions)}\n")
+                return
+            name, _, delta = argument.partition(" ")
+            if name in self.values:
+                subscriptions[name] = float(delta) if delta else 0.0
+                self._send(writer, f"DIFF:{name},{self.values[name]}\n")
+            else:
+                self._send(writer, f"ERROR:EN {name}\n")
+        elif keyword == "DI":
+            self._subscribers[writer].pop(argument, None)
+        elif keyword == "GETINFO":
+            self._send(
+                writer,
+                "GETINFO:VERSION,simulator\n"
+                "GETINFO:VERSION_PLC,simulator\n"
+                f"GETINFO:NETWORK,{len(self._subscribers)} clients\n"
+                "GETINFO:\n",
+            )
+        elif command:
+            self._send(writer, f"ERROR:{command}\n")
+
+
+async def _serve(args) -> None:
+    """Run the simulator until interrupted."""
+    simulator = PLCComsSimulator(
+        variables=args.variables,
+        change_rate=args.change_rate,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        drop_rate=args.drop_rate,
+    )
+    port = await simulator.start(args.host, args.port)
+    print(
+        f"PLCComS simulator with {args.variables} variables "
+        f"on {args.host}:{port}"
+    )
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await simulator.stop()
+
+
+def main() -> None:
+    """Run the simulator from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5010)
+    parser.add_argument("--variables", type=int, default=1000)
+    parser.add_argument("--change-rate", type=float, default=0.05)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
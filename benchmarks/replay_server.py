@@ -0,0 +1,238 @@
+"""PLCComS server that replays a recorded session.
+
+Takes a capture written by the foxtrot_plc.start_recording service (or a
+trace written by dump_trace), rebuilds the catalog from its LIST:
+response and the value history from its GET: responses and DIFF:
+pushes, and serves them to the integration like the simulator does.
+
+At --speed 1 or 10 the values change on the recorded schedule, sped up
+by that factor, and responses keep the recorded GET: latency. With
+--speed 0 (as fast as possible) there is no clock: every GET: of a
+variable returns its next recorded value and DIFF: pushes are streamed
+as fast as the subscriber reads them.
+
+    python benchmarks/replay_server.py capture.jsonl.gz --speed 10 --port 5010
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+from collections import defaultdict
+
+from _common import load_integration
+from plccoms_simulator import PLCComsSimulator
+
+load_integration()
+
+from foxtrot_plc.parser import ResponseParser  # noqa: E402
+from foxtrot_plc.trace import SENT, read_trace  # noqa: E402
+
+# Pushes are paused while this many bytes wait to be sent to a subscriber
+MAX_BACKLOG = 1 << 20
+
+
+def guess_type(value: str) -> str:
+    """Return a PLC type for a value of a capture without a LIST: response."""
+    if value in ("0", "1"):
+        return "BOOL"
+    try:
+        int(value)
+        return "INT"
+    except ValueError:
+        pass
+    try:
+        float(value)
+        return "REAL"
+    except ValueError:
+        return "STRING"
+
+
+class Capture:
+    """Catalog, value history and latency of a recorded session."""
+
+    def __init__(self, path: str) -> None:
+        """Load and parse a capture file."""
+        self.header, entries = read_trace(path)
+        self.types = {}
+        # (t, name, value, pushed) in recorded order
+        self.events = []
+        parsers = defaultdict(ResponseParser)
+        sent = {}
+        latencies = []
+        for t, connection, direction, data in entries:
+            if direction == SENT:
+                if b"GET:" in data:
+                    sent.setdefault(connection, t)
+                continue
+            if connection in sent:
+                latencies.append(t - sent.pop(connection))
+            for keyword, name, value in parsers[connection].feed(data):
+                if keyword == "LIST" and name:
+                    self.types[name] = (value or "").strip()
+                elif keyword in ("GET", "DIFF") and value is not None:
+                    self.events.append((t, name, value, keyword == "DIFF"))
+        for _, name, value, _ in self.events:
+            if name not in self.types:
+                self.types[name] = guess_type(value)
+        self.duration = self.events[-1][0] if self.events else 0.0
+        self.latency = statistics.median(latencies) if latencies else 0.0
+
+    def samples(self) -> dict[str, list[str]]:
+        """Return the recorded values of every variable, in order."""
+        samples = defaultdict(list)
+        for _, name, value, _ in self.events:
+            samples[name].append(value)
+        return samples
+
+
+class PLCComsReplay(PLCComsSimulator):
+    """Simulated PLCComS server driven by a recorded session."""
+
+    def __init__(
+        self, capture: Capture, speed: float = 1.0, loop: bool = False
+    ):
+        """Initialize the server, speed 0 replays as fast as possible."""
+        super().__init__(
+            variables=0, latency=capture.latency / speed if speed else 0
+        )
+        self.capture = capture
+        self.speed = speed
+        self.loop = loop
+        self.types = dict(capture.types)
+        self._samples = capture.samples()
+        self.values = {
+            name: self._samples[name][0] if name in self._samples else "0"
+            for name in self.types
+        }
+        self._cursors = dict.fromkeys(self._samples, 0)
+        self.replayed = 0
+        self.finished = asyncio.Event()
+        self._connected = asyncio.Event()
+        self._subscribed = asyncio.Event()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Start listening and replaying, return the bound port."""
+        port = await super().start(host, port)
+        self._ticker = asyncio.get_running_loop().create_task(
+            self._run_replay()
+        )
+        return port
+
+    async def _handle_client(self, reader, writer) -> None:
+        """Serve one client, the replay clock starts with the first."""
+        self._connected.set()
+        await super()._handle_client(reader, writer)
+
+    def _handle_command(self, writer, command: str) -> None:
+        """Answer a command, advancing polled variables without a clock."""
+        keyword, _, argument = command.partition(":")
+        if keyword == "EN" and argument:
+            self._subscribed.set()
+        elif keyword == "GET" and not self.speed and argument in self._samples:
+            samples = self._samples[argument]
+            cursor = self._cursors[argument]
+            if cursor < len(samples):
+                self.values[argument] = samples[cursor]
+                self._cursors[argument] = cursor + 1
+                self.replayed += 1
+            elif self.loop:
+                self.values[argument] = samples[0]
+                self._cursors[argument] = 1
+        super()._handle_command(writer, command)
+
+    async def _run_replay(self) -> None:
+        """Apply the recorded changes until the capture ends."""
+        if self.speed:
+            await self._connected.wait()
+            await self._replay_timed()
+        else:
+            await self._subscribed.wait()
+            await self._replay_pushes()
+        self.finished.set()
+
+    async def _replay_timed(self) -> None:
+        """Change values on the recorded schedule, sped up."""
+        loop = asyncio.get_running_loop()
+        events = self.capture.events
+        while True:
+            start = loop.time()
+            for t, name, value, _ in events:
+                delay = start + t / self.speed - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                if self.values.get(name) != value:
+                    self.set_value(name, value)
+                    self.replayed += 1
+            if not self.loop or not events:
+                return
+            await asyncio.sleep(0)
+
+    async def _replay_pushes(self) -> None:
+        """Stream the recorded DIFF: pushes without pauses."""
+        pushes = [event for event in self.capture.events if event[3]]
+        while True:
+            for index, (_, name, value, _) in enumerate(pushes):
+                self.set_value(name, value)
+                self.replayed += 1
+                if index % 256 == 255:
+                    await self._wait_backlog()
+            if not self.loop or not pushes:
+                return
+            await self._wait_backlog()
+
+    async def _wait_backlog(self) -> None:
+        """Yield, and wait while a subscriber falls behind."""
+        await asyncio.sleep(0)
+        while any(
+            writer.transport.get_write_buffer_size() > MAX_BACKLOG
+            for writer in self._subscribers
+            if not writer.is_closing()
+        ):
+            await asyncio.sleep(0.001)
+
+
+async def _serve(args) -> None:
+    """Replay a capture and keep serving until interrupted."""
+    capture = Capture(args.capture)
+    server = PLCComsReplay(capture, args.speed, args.loop)
+    port = await server.start(args.host, args.port)
+    speed = f"{args.speed:g}x" if args.speed else "as fast as possible"
+    print(
+        f"Replaying {len(capture.types)} variables, "
+        f"{len(capture.events)} values over {capture.duration:.1f}s "
+        f"at {speed} on {args.host}:{port}",
+        flush=True,
+    )
+    try:
+        await server.finished.wait()
+        print("Capture replayed, serving the final values", flush=True)
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main() -> None:
+    """Run the replay server from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("capture")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5010)
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="1, 10, ... or 0 for as fast as possible",
+    )
+    parser.add_argument(
+        "--loop", action="store_true", help="restart at the end"
+    )
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
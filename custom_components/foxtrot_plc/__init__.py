@@ -2,38 +2,314 @@
 
 from __future__ import annotations
 
+import os
+import time
+
+import homeassistant.helpers.config_validation as cv
+import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, ServiceCall
-from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.exceptions import ConfigEntryNotReady, HomeAssistantError
+from homeassistant.helpers.storage import Store
 
 from .const import (
+    CONF_ADAPTIVE_INTERVAL,
+    CONF_AGGREGATION,
+    CONF_BATCH_SIZE,
+    CONF_CATALOG_TTL,
+    CONF_CONNECTIONS,
+    CONF_DEADBANDS,
+    CONF_DETAILED_LOGGING,
+    CONF_EXCLUDE_VARIABLE_PREFIXES,
     CONF_IGNORE_ZERO,
+    CONF_LOG_LEVEL,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
     CONF_PLC_IP,
     CONF_PLC_PORT,
+    CONF_RESYNC_INTERVAL,
+    CONF_SCAN_GROUPS,
     CONF_SCAN_INTERVAL,
+    CONF_SELECT_OPTIONS,
+    CONF_SUBSCRIPTION_MODE,
     CONF_VARIABLE_PREFIXES,
-    CONF_EXCLUDE_VARIABLE_PREFIXES,
-    CONF_LOG_LEVEL,
-    CONF_DETAILED_LOGGING,
+    CONF_WRITABLE_PREFIXES,
+    DATA_SCHEDULER,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_CATALOG_TTL,
+    DEFAULT_CONNECTIONS,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_RESYNC_INTERVAL,
     DOMAIN,
+    SERVICE_DUMP_TRACE,
+    SERVICE_GET_DIAGNOSTICS,
+    SERVICE_REFRESH_CATALOG,
+    SERVICE_SET_VARIABLE,
+    SERVICE_SET_VARIABLES,
+    SERVICE_START_RECORDING,
+    SERVICE_STOP_RECORDING,
+    STORAGE_VERSION,
 )
 from .coordinator import FoxtrotPLCCoordinator
+from .scheduler import FoxtrotPLCScheduler
+
+PLATFORMS: list[Platform] = [
+    Platform.SENSOR,
+    Platform.BINARY_SENSOR,
+    Platform.SWITCH,
+    Platform.NUMBER,
+    Platform.SELECT,
+]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+# Options the coordinator applies without reloading the entry
+HOT_OPTIONS = frozenset(
+    {
+        CONF_SCAN_INTERVAL,
+        CONF_VARIABLE_PREFIXES,
+        CONF_EXCLUDE_VARIABLE_PREFIXES,
+        CONF_IGNORE_ZERO,
+        CONF_LOG_LEVEL,
+        CONF_DETAILED_LOGGING,
+    }
+)
+
+ATTR_ENTRY_ID = "entry_id"
+ATTR_FILENAME = "filename"
+
+ENTRY_SCHEMA = vol.Schema({vol.Optional(ATTR_ENTRY_ID): cv.string})
+DUMP_TRACE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_FILENAME): cv.string,
+    }
+)
+SET_VARIABLE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTRY_ID): cv.string,
+        vol.Required("variable"): cv.string,
+        vol.Required("value"): vol.Any(bool, int, float, cv.string),
+    }
+)
+SET_VARIABLES_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTRY_ID): cv.string,
+        vol.Required("variables"): {
+            cv.string: vol.Any(bool, int, float, cv.string)
+        },
+    }
+)
+
+
+def _get_coordinators(
+    hass: HomeAssistant, call: ServiceCall, single: bool = False
+):
+    """Return the coordinators a service call is for.
+
+    Without an entry_id the call goes to every loaded PLC, except writes,
+    which need an entry_id once more than one PLC is configured.
+    """
+    coordinators = hass.data.get(DOMAIN, {})
+    entry_id = call.data.get(ATTR_ENTRY_ID)
+    if entry_id is not None:
+        if entry_id not in coordinators:
+            raise HomeAssistantError(f"No loaded Foxtrot PLC entry {entry_id}")
+        return [coordinators[entry_id]]
+    if not coordinators:
+        raise HomeAssistantError("No Foxtrot PLC is loaded")
+    if single and len(coordinators) > 1:
+        raise HomeAssistantError(
+            "Several Foxtrot PLCs are configured, select one with entry_id"
+        )
+    return list(coordinators.values())
+
+
+async def _async_trace_path(
+    hass: HomeAssistant,
+    coordinator: FoxtrotPLCCoordinator,
+    filename: str | None,
+    kind: str,
+    suffix: str,
+) -> str:
+    """Return the path of a trace file, named after the PLC if not given.
+
+    Relative names are resolved against the configuration directory. The
+    resulting path must be in an allowed directory or, after following
+    ".." and symlinks, still in the configuration directory.
+    """
+    if filename is None:
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        host = coordinator.client.primary.host
+        filename = f"{DOMAIN}_{kind}_{host}_{stamp}{suffix}"
+    path = os.path.normpath(hass.config.path(filename))
+    if not await hass.async_add_executor_job(_is_writable_path, hass, path):
+        raise HomeAssistantError(f"Writing to {path} is not allowed")
+    return path
+
+
+def _is_writable_path(hass: HomeAssistant, path: str) -> bool:
+    """Return True if a trace may be written to a path, in the executor."""
+    if hass.config.is_allowed_path(path):
+        return True
+    config_dir = os.path.realpath(hass.config.config_dir)
+    real_path = os.path.realpath(path)
+    return os.path.commonpath((real_path, config_dir)) == config_dir
+
+
+def _entry_options(entry: ConfigEntry) -> dict:
+    """Return the options of an entry, with defaults for those never saved."""
+    options = dict(entry.options)
+    options.setdefault(
+        CONF_SCAN_INTERVAL, entry.data.get(CONF_SCAN_INTERVAL, 30)
+    )
+    options.setdefault(
+        CONF_VARIABLE_PREFIXES, entry.data.get(CONF_VARIABLE_PREFIXES, "")
+    )
+    options.setdefault(
+        CONF_EXCLUDE_VARIABLE_PREFIXES,
+        entry.data.get(CONF_EXCLUDE_VARIABLE_PREFIXES, ""),
+    )
+    options.setdefault(CONF_IGNORE_ZERO, True)
+    options.setdefault(CONF_LOG_LEVEL, entry.data.get(CONF_LOG_LEVEL, "info"))
+    options.setdefault(
+        CONF_DETAILED_LOGGING, entry.data.get(CONF_DETAILED_LOGGING, False)
+    )
+    options.setdefault(CONF_SUBSCRIPTION_MODE, False)
+    options.setdefault(CONF_RESYNC_INTERVAL, DEFAULT_RESYNC_INTERVAL)
+    options.setdefault(CONF_BATCH_SIZE, DEFAULT_BATCH_SIZE)
+    options.setdefault(CONF_CATALOG_TTL, DEFAULT_CATALOG_TTL)
+    options.setdefault(CONF_CONNECTIONS, DEFAULT_CONNECTIONS)
+    options.setdefault(CONF_SCAN_GROUPS, "")
+    options.setdefault(CONF_WRITABLE_PREFIXES, "")
+    options.setdefault(CONF_SELECT_OPTIONS, "")
+    options.setdefault(CONF_DEADBANDS, "")
+    options.setdefault(CONF_ADAPTIVE_INTERVAL, False)
+    options.setdefault(CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL)
+    options.setdefault(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL)
+    options.setdefault(CONF_AGGREGATION, "")
+    return options
+
+
+async def async_setup(hass: HomeAssistant, config: dict) -> bool:
+    """Set up the shared scheduler and the services of all PLCs."""
+    hass.data[DATA_SCHEDULER] = FoxtrotPLCScheduler(hass)
+
+    async def async_get_diagnostics(call: ServiceCall) -> None:
+        """Handle get diagnostics service call."""
+        for coordinator in _get_coordinators(hass, call):
+            diagnostics = await coordinator.get_diagnostics()
+            hass.components.persistent_notification.async_create(
+                f"Foxtrot PLC Diagnostics:\n\n{diagnostics}",
+                title=f"{coordinator.name} Diagnostics",
+            )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_DIAGNOSTICS,
+        async_get_diagnostics,
+        schema=ENTRY_SCHEMA,
+    )
+
+    async def async_refresh_catalog(call: ServiceCall) -> None:
+        """Handle refresh catalog service call."""
+        for coordinator in _get_coordinators(hass, call):
+            await coordinator.async_refresh_catalog()
+            await coordinator.async_request_refresh()
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REFRESH_CATALOG,
+        async_refresh_catalog,
+        schema=ENTRY_SCHEMA,
+    )
+
+    async def async_dump_trace(call: ServiceCall) -> None:
+        """Handle dump trace service call."""
+        filename = call.data.get(ATTR_FILENAME)
+        # A given filename names one file, so it needs one PLC
+        for coordinator in _get_coordinators(
+            hass, call, single=filename is not None
+        ):
+            path = await _async_trace_path(
+                hass, coordinator, filename, "trace", ".jsonl"
+            )
+            await coordinator.async_dump_trace(path)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_DUMP_TRACE,
+        async_dump_trace,
+        schema=DUMP_TRACE_SCHEMA,
+    )
+
+    async def async_start_recording(call: ServiceCall) -> None:
+        """Handle start recording service call."""
+        filename = call.data.get(ATTR_FILENAME)
+        for coordinator in _get_coordinators(
+            hass, call, single=filename is not None
+        ):
+            path = await _async_trace_path(
+                hass, coordinator, filename, "capture", ".jsonl.gz"
+            )
+            await coordinator.async_start_recording(path)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_RECORDING,
+        async_start_recording,
+        schema=DUMP_TRACE_SCHEMA,
+    )
+
+    async def async_stop_recording(call: ServiceCall) -> None:
+        """Handle stop recording service call."""
+        for coordinator in _get_coordinators(hass, call):
+            await coordinator.async_stop_recording()
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STOP_RECORDING,
+        async_stop_recording,
+        schema=ENTRY_SCHEMA,
+    )
+
+    async def async_set_variable(call: ServiceCall) -> None:
+        """Handle set variable service call."""
+        (coordinator,) = _get_coordinators(hass, call, single=True)
+        await coordinator.async_set_variables(
+            {call.data["variable"]: call.data["value"]}
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_VARIABLE,
+        async_set_variable,
+        schema=SET_VARIABLE_SCHEMA,
+    )
+
+    async def async_set_variables(call: ServiceCall) -> None:
+        """Handle bulk set variables service call."""
+        (coordinator,) = _get_coordinators(hass, call, single=True)
+        await coordinator.async_set_variables(call.data["variables"])
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_VARIABLES,
+        async_set_variables,
+        schema=SET_VARIABLES_SCHEMA,
+    )
+
+    return True
 
-PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.BINARY_SENSOR]
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Foxtrot PLC from a config entry."""
     plc_ip = entry.data[CONF_PLC_IP]
     plc_port = entry.data[CONF_PLC_PORT]
 
-    options = dict(entry.options)
-    options.setdefault(CONF_SCAN_INTERVAL, entry.data.get(CONF_SCAN_INTERVAL, 30))
-    options.setdefault(CONF_VARIABLE_PREFIXES, entry.data.get(CONF_VARIABLE_PREFIXES, ""))
-    options.setdefault(CONF_EXCLUDE_VARIABLE_PREFIXES, entry.data.get(CONF_EXCLUDE_VARIABLE_PREFIXES, ""))
-    options.setdefault(CONF_IGNORE_ZERO, True)
-    options.setdefault(CONF_LOG_LEVEL, entry.data.get(CONF_LOG_LEVEL, "info"))
-    options.setdefault(CONF_DETAILED_LOGGING, entry.data.get(CONF_DETAILED_LOGGING, False))
+    options = _entry_options(entry)
 
     coordinator = FoxtrotPLCCoordinator(
         hass,
@@ -45,47 +321,93 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         options[CONF_IGNORE_ZERO],
         options[CONF_LOG_LEVEL],
         options[CONF_DETAILED_LOGGING],
+        options[CONF_SUBSCRIPTION_MODE],
+        options[CONF_RESYNC_INTERVAL],
+        options[CONF_BATCH_SIZE],
+        options[CONF_CATALOG_TTL],
+        options[CONF_CONNECTIONS],
+        options[CONF_SCAN_GROUPS],
+        options[CONF_WRITABLE_PREFIXES],
+        options[CONF_SELECT_OPTIONS],
+        options[CONF_DEADBANDS],
+        options[CONF_ADAPTIVE_INTERVAL],
+        options[CONF_MIN_SCAN_INTERVAL],
+        options[CONF_MAX_SCAN_INTERVAL],
+        options[CONF_AGGREGATION],
+        scheduler=hass.data[DATA_SCHEDULER],
     )
 
-    try:
-        await coordinator.async_config_entry_first_refresh()
-    except ConfigEntryNotReady:
-        await coordinator.client.disconnect()
-        raise
+    # With a cache from a previous run the entities are created right away
+    # and the live values replace the cached ones once the PLC answers
+    cached = await coordinator.async_load_cache()
+    if not cached:
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except ConfigEntryNotReady:
+            await coordinator.async_shutdown()
+            raise
 
+    coordinator.entry_options = options
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
-    entry.async_on_unload(entry.add_update_listener(update_listener))
-
-    async def async_get_diagnostics(call: ServiceCall) -> None:
-        """Handle get diagnostics service call."""
-        coordinator = hass.data[DOMAIN][entry.entry_id]
-        diagnostics = await coordinator.get_diagnostics()
-        hass.components.persistent_notification.async_create(
-            f"Foxtrot PLC Diagnostics:\n\n{diagnostics}",
-            title="Foxtrot PLC Diagnostics",
+    if cached:
+        entry.async_create_background_task(
+            hass,
+            coordinator.async_refresh(),
+            f"{DOMAIN} {entry.entry_id} refresh",
         )
 
-    hass.services.async_register(
-        DOMAIN,
-        "get_diagnostics",
-        async_get_diagnostics,
-    )
+    entry.async_on_unload(entry.add_update_listener(update_listener))
 
     return True
 
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+    if unload_ok := await hass.config_entries.async_unload_platforms(
+        entry, PLATFORMS
+    ):
         hass.data[DOMAIN].pop(entry.entry_id)
     return unload_ok
 
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cache of a deleted config entry."""
+    await Store(
+        hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}"
+    ).async_remove()
+
+
 async def update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Handle options update."""
+    """Handle options update.
+
+    Changes limited to HOT_OPTIONS are applied by the running coordinator,
+    anything else reloads the entry.
+    """
+    coordinator = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    options = _entry_options(entry)
+    if coordinator is not None:
+        changed = {
+            key
+            for key in options.keys() | coordinator.entry_options.keys()
+            if options.get(key) != coordinator.entry_options.get(key)
+        }
+        if changed <= HOT_OPTIONS:
+            coordinator.entry_options = options
+            await coordinator.async_apply_options(
+                options[CONF_SCAN_INTERVAL],
+                options[CONF_VARIABLE_PREFIXES],
+                options[CONF_EXCLUDE_VARIABLE_PREFIXES],
+                options[CONF_IGNORE_ZERO],
+                options[CONF_LOG_LEVEL],
+                options[CONF_DETAILED_LOGGING],
+            )
+            return
     await hass.config_entries.async_reload(entry.entry_id)
 
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry."""
     await async_unload_entry(hass, entry)
@@ -0,0 +1,76 @@
+"""Poll intervals that follow how often PLC values actually change."""
+
+from __future__ import annotations
+
+# Weight of the newest poll in the smoothed change rate
+SMOOTHING = 0.3
+# Smoothed share of changed values above which polling speeds up
+BUSY_CHANGE_RATE = 0.05
+# Smoothed share of changed values below which polling slows down
+IDLE_CHANGE_RATE = 0.005
+SPEED_UP = 0.5
+SLOW_DOWN = 1.25
+# A refresh taking more than this share of the interval counts as overrun
+OVERRUN_SHARE = 0.5
+BACK_OFF = 2.0
+
+
+class AdaptiveInterval:
+    """Poll interval of one scan group, tuned after every poll.
+
+    The interval halves while many values change, grows slowly while the
+    values sit still, and backs off when refreshes take so long that they
+    would overrun it. It always stays within the configured bounds.
+    """
+
+    __slots__ = ("interval", "minimum", "maximum", "change_rate", "overruns")
+
+    def __init__(
+        self, interval: float, minimum: float, maximum: float
+    ) -> None:
+        """Start from the configured interval."""
+        self.minimum = minimum
+        self.maximum = max(minimum, maximum)
+        self.interval = self._clamp(interval)
+        self.change_rate = None
+        self.overruns = 0
+
+    def _clamp(self, interval: float) -> float:
+        """Keep an interval within the bounds."""
+        return min(self.maximum, max(self.minimum, interval))
+
+    def observe(self, changed: int, polled: int, duration: float) -> float:
+        """Update the interval from one poll and return it."""
+        if polled:
+            rate = changed / polled
+            self.change_rate = (
+                rate
+                if self.change_rate is None
+                else SMOOTHING * rate + (1 - SMOOTHING) * self.change_rate
+            )
+
+        if duration > self.interval * OVERRUN_SHARE:
+            self.overruns += 1
+            interval = max(self.interval * BACK_OFF, duration / OVERRUN_SHARE)
+        elif self.change_rate is None:
+            interval = self.interval
+        elif self.change_rate >= BUSY_CHANGE_RATE:
+            interval = self.interval * SPEED_UP
+        elif self.change_rate <= IDLE_CHANGE_RATE:
+            interval = self.interval * SLOW_DOWN
+        else:
+            interval = self.interval
+        self.interval = self._clamp(interval)
+        return self.interval
+
+    def as_dict(self) -> dict:
+        """Return the state for diagnostics."""
+        return {
+            "interval": round(self.interval, 2),
+            "change_rate": (
+                None
+                if self.change_rate is None
+                else round(self.change_rate, 4)
+            ),
+            "overruns": self.overruns,
+        }
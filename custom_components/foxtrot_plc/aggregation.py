@@ -0,0 +1,125 @@
+"""Windowed aggregation of fast polled analog values."""
+
+from __future__ import annotations
+
+from array import array
+
+STATISTICS = ("mean", "min", "max", "last")
+
+
+class WindowAggregate:
+    """Samples of one variable over the current window, in a fixed-size ring.
+
+    Every polled value is added as a sample, but a value is only published
+    when the window closes: the chosen statistic of the samples in it,
+    with the others kept as a summary for the entity attributes. The first
+    sample is published right away so the entity starts with a state.
+    A window closes with the first sample after its end, which then
+    starts the next window, or with flush() once it has ended, so values
+    that stop changing are still published.
+
+    Samples are stored as doubles in an array of fixed capacity. A window
+    receiving more samples than fit keeps the newest ones, and its
+    statistics cover those; the summary still counts every sample.
+    """
+
+    __slots__ = (
+        "statistic",
+        "window",
+        "window_end",
+        "summary",
+        "_samples",
+        "_count",
+        "_last",
+        "_integer",
+    )
+
+    def __init__(self, statistic: str, window: float, capacity: int) -> None:
+        """Initialize an empty aggregate."""
+        self.statistic = statistic
+        self.window = window
+        self.window_end = None
+        self.summary = None
+        self._samples = array("d", bytes(8 * max(1, capacity)))
+        self._count = 0
+        self._last = None
+        self._integer = False
+
+    @property
+    def capacity(self) -> int:
+        """Return the number of samples the ring holds."""
+        return len(self._samples)
+
+    @property
+    def pending(self) -> bool:
+        """Return True if the current window has unpublished samples."""
+        return self._count > 0
+
+    def add(self, value: int | float, now: float) -> int | float | None:
+        """Add a sample, return the value to publish if a window closed."""
+        if self.window_end is None:
+            self._integer = isinstance(value, int)
+            self.window_end = now + self.window
+            self._store(value)
+            return self._close()
+        published = None
+        if now >= self.window_end:
+            published = self._advance(now)
+        self._store(value)
+        return published
+
+    def _store(self, value: int | float) -> None:
+        """Put a sample into the ring."""
+        samples = self._samples
+        samples[self._count % len(samples)] = value
+        self._count += 1
+        self._last = value
+
+    def flush(self, now: float) -> int | float | None:
+        """Close an ended window with samples, return the value to publish."""
+        if not self._count or now < self.window_end:
+            return None
+        return self._advance(now)
+
+    def _advance(self, now: float) -> int | float | None:
+        """Close the ended window and move on to the one holding now.
+
+        Returns None if the ended window had no samples to publish.
+        """
+        if now < self.window_end + self.window:
+            # Windows stay aligned to the first sample while samples keep up
+            self.window_end += self.window
+        else:
+            self.window_end = now + self.window
+        return self._close() if self._count else None
+
+    def _close(self) -> int | float:
+        """Summarize the samples of the window and start the next one."""
+        count = self._count
+        samples = self._samples
+        if count < len(samples):
+            samples = samples[:count]
+        low = min(samples)
+        high = max(samples)
+        last = self._last
+        if self._integer:
+            low, high, last = int(low), int(high), int(last)
+        self.summary = {
+            "mean": sum(samples) / len(samples),
+            "min": low,
+            "max": high,
+            "last": last,
+            "samples": count,
+        }
+        self._count = 0
+        return self.summary[self.statistic]
+
+    def attributes(self) -> dict | None:
+        """Return the summary of the published window for the entity."""
+        if self.summary is None:
+            return None
+        return {
+            "statistic": self.statistic,
+            "window": self.window,
+            **self.summary,
+        }
@@ -0,0 +1,155 @@
+"""Back-off for failing variables and PLCComS connections."""
+
+from __future__ import annotations
+
+import random
+import time
+
+from .const import (
+    QUARANTINE_MAX_DELAY,
+    QUARANTINE_MIN_DELAY,
+    QUARANTINE_THRESHOLD,
+    RECONNECT_MAX_DELAY,
+    RECONNECT_MIN_DELAY,
+)
+
+
+class Backoff:
+    """Exponential delay before retrying after consecutive failures.
+
+    The delay doubles with every failure up to the maximum and is spread
+    over its upper half by random jitter, so that connections dropped
+    together do not all come back at the same moment.
+    """
+
+    __slots__ = ("minimum", "maximum", "failures", "retry_at", "_random")
+
+    def __init__(
+        self,
+        minimum: float = RECONNECT_MIN_DELAY,
+        maximum: float = RECONNECT_MAX_DELAY,
+        rng: random.Random | None = None,
+    ) -> None:
+        """Initialize without failures."""
+        self.minimum = minimum
+        self.maximum = max(minimum, maximum)
+        self.failures = 0
+        self.retry_at = 0.0
+        self._random = rng or random.Random()
+
+    def failure(self, now: float | None = None) -> float:
+        """Count a failure and return the delay before the next attempt."""
+        self.failures += 1
+        delay = min(self.maximum, self.minimum * 2 ** (self.failures - 1))
+        delay *= 0.5 + self._random.random() / 2
+        self.retry_at = (time.monotonic() if now is None else now) + delay
+        return delay
+
+    def success(self) -> None:
+        """Forget the failures."""
+        self.failures = 0
+        self.retry_at = 0.0
+
+    def remaining(self, now: float | None = None) -> float:
+        """Return the seconds to wait before the next attempt."""
+        if not self.failures:
+            return 0.0
+        return max(
+            0.0, self.retry_at - (time.monotonic() if now is None else now)
+        )
+
+    def as_dict(self) -> dict:
+        """Return the state for diagnostics."""
+        return {
+            "failures": self.failures,
+            "retry_in": round(self.remaining(), 1),
+        }
+
+
+class _FailingVariable:
+    """Failure record of one variable."""
+
+    __slots__ = ("failures", "error", "backoff")
+
+    def __init__(self) -> None:
+        """Initialize the record."""
+        self.failures = 0
+        self.error = None
+        self.backoff = Backoff(QUARANTINE_MIN_DELAY, QUARANTINE_MAX_DELAY)
+
+
+class VariableQuarantine:
+    """Variables whose reads keep failing, polled again after a back-off.
+
+    A variable enters quarantine after QUARANTINE_THRESHOLD consecutive
+    failed reads, or after a single read that timed out, and is then
+    left out of polls until its back-off expires. Each retry that fails
+    doubles the back-off; the first successful read releases it.
+    """
+
+    def __init__(self, threshold: int = QUARANTINE_THRESHOLD) -> None:
+        """Initialize an empty quarantine."""
+        self.threshold = threshold
+        self._failing = {}
+
+    def __contains__(self, variable: str) -> bool:
+        """Return True if the last read of a variable failed."""
+        return variable in self._failing
+
+    def __len__(self) -> int:
+        """Return the number of variables whose last read failed."""
+        return len(self._failing)
+
+    @property
+    def quarantined(self) -> list[str]:
+        """Return the variables currently held back from polls."""
+        return [
+            variable
+            for variable, record in self._failing.items()
+            if record.backoff.failures
+        ]
+
+    def failed(
+        self, variable: str, error: str, immediate: bool = False
+    ) -> float | None:
+        """Count a failed read, return the retry delay if it is quarantined."""
+        record = self._failing.get(variable)
+        if record is None:
+            record = self._failing[variable] = _FailingVariable()
+        record.failures += 1
+        record.error = error
+        if immediate or record.failures >= self.threshold:
+            return record.backoff.failure()
+        return None
+
+    def succeeded(self, variable: str) -> None:
+        """Release a variable after a successful read."""
+        self._failing.pop(variable, None)
+
+    def due(self, variables) -> list[str]:
+        """Return the variables to poll now, leaving out quarantined ones."""
+        if not self._failing:
+            return (
+                variables if isinstance(variables, list) else list(variables)
+            )
+        now = time.monotonic()
+        failing = self._failing
+        return [
+            variable
+            for variable in variables
+            if variable not in failing
+            or not failing[variable].backoff.remaining(now)
+        ]
+
+    def as_dict(self) -> list[dict]:
+        """Return the failing variables for diagnostics."""
+        return [
+            {
+                "variable": variable,
+                "failures": record.failures,
+                "error": record.error,
+                "quarantined": bool(record.backoff.failures),
+                "retry_in": round(record.backoff.remaining(), 1),
+            }
+            for variable, record in self._failing.items()
+        ]
@@ -0,0 +1,102 @@
+"""Variable catalog for the Foxtrot PLC integration."""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Callable
+from typing import Any
+
+# 0 and 1 stay numbers, as sensor states of BOOL variables have always been;
+# only the textual forms are Python bools
+_BOOL_VALUES = {"0": 0, "1": 1, "false": False, "true": True}
+_BOOL_VALUES.update(
+    {key.upper(): value for key, value in _BOOL_VALUES.items()}
+)
+
+INTEGER_TYPES = frozenset(
+    (
+        "SINT",
+        "INT",
+        "DINT",
+        "LINT",
+        "USINT",
+        "UINT",
+        "UDINT",
+        "ULINT",
+        "BYTE",
+        "WORD",
+        "DWORD",
+        "LWORD",
+    )
+)
+REAL_TYPES = frozenset(("REAL", "LREAL"))
+TEXT_TYPES = frozenset(
+    (
+        "STRING",
+        "WSTRING",
+        "TIME",
+        "DATE",
+        "TOD",
+        "TIME_OF_DAY",
+        "DT",
+        "DATE_AND_TIME",
+    )
+)
+
+
+def _decode_bool(value: str) -> Any:
+    """Decode a BOOL value, keeping anything unexpected as text."""
+    return _BOOL_VALUES.get(value, value)
+
+
+def _decode_text(value: str) -> str:
+    """Keep a textual value as it is."""
+    return value
+
+
+def base_type(plc_type: str) -> str:
+    """Return the bare PLC type, e.g. STRING for STRING[80]."""
+    return plc_type.partition("[")[0].strip().upper()
+
+
+def decoder_for(plc_type: str) -> Callable[[str], Any] | None:
+    """Return the value decoder for a PLC type, None if the type is unknown.
+
+    int and float decoders raise ValueError on malformed values.
+    """
+    plc_type = base_type(plc_type)
+    if plc_type == "BOOL":
+        return _decode_bool
+    if plc_type in INTEGER_TYPES:
+        return int
+    if plc_type in REAL_TYPES:
+        return float
+    if plc_type in TEXT_TYPES:
+        return _decode_text
+    return None
+
+
+class VariableCatalog:
+    """Names and PLC types of the variables published by PLCComS."""
+
+    def __init__(self, types: dict[str, str]) -> None:
+        """Initialize the catalog from a LIST: result."""
+        self.types = types
+        digest = hashlib.sha1()
+        for name, plc_type in types.items():
+            digest.update(f"{name},{plc_type}\n".encode())
+        # Changes only when the PLC program (and so the listing) changes
+        self.version = digest.hexdigest()
+
+    @property
+    def names(self) -> list[str]:
+        """Return the variable names in PLC order."""
+        return list(self.types)
+
+    def __len__(self) -> int:
+        """Return the number of variables."""
+        return len(self.types)
+
+    def __contains__(self, name: object) -> bool:
+        """Return True if the variable is in the catalog."""
+        return name in self.types
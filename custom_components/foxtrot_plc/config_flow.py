@@ -8,19 +8,39 @@ from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 
 from .const import (
+    CONF_ADAPTIVE_INTERVAL,
+    CONF_AGGREGATION,
+    CONF_BATCH_SIZE,
+    CONF_CATALOG_TTL,
+    CONF_CONNECTIONS,
+    CONF_DEADBANDS,
+    CONF_DETAILED_LOGGING,
+    CONF_EXCLUDE_VARIABLE_PREFIXES,
     CONF_IGNORE_ZERO,
+    CONF_LOG_LEVEL,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
     CONF_PLC_IP,
     CONF_PLC_PORT,
+    CONF_RESYNC_INTERVAL,
+    CONF_SCAN_GROUPS,
     CONF_SCAN_INTERVAL,
+    CONF_SELECT_OPTIONS,
+    CONF_SUBSCRIPTION_MODE,
     CONF_VARIABLE_PREFIXES,
-    CONF_EXCLUDE_VARIABLE_PREFIXES,
-    CONF_LOG_LEVEL,
-    CONF_DETAILED_LOGGING,
+    CONF_WRITABLE_PREFIXES,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_CATALOG_TTL,
+    DEFAULT_CONNECTIONS,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_RESYNC_INTERVAL,
     DOMAIN,
     LOG_LEVEL_DEBUG,
+    LOG_LEVEL_ERROR,
     LOG_LEVEL_INFO,
     LOG_LEVEL_WARNING,
-    LOG_LEVEL_ERROR,
+    MAX_CONNECTIONS,
 )
 
 STEP_USER_DATA_SCHEMA = vol.Schema(
@@ -30,16 +50,19 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
         vol.Required(CONF_SCAN_INTERVAL, default=30): int,
         vol.Required(CONF_VARIABLE_PREFIXES): str,
         vol.Optional(CONF_EXCLUDE_VARIABLE_PREFIXES, default=""): str,
-        vol.Required(CONF_LOG_LEVEL, default=LOG_LEVEL_INFO): vol.In([
-            LOG_LEVEL_DEBUG,
-            LOG_LEVEL_INFO,
-            LOG_LEVEL_WARNING,
-            LOG_LEVEL_ERROR,
-        ]),
+        vol.Required(CONF_LOG_LEVEL, default=LOG_LEVEL_INFO): vol.In(
+            [
+                LOG_LEVEL_DEBUG,
+                LOG_LEVEL_INFO,
+                LOG_LEVEL_WARNING,
+                LOG_LEVEL_ERROR,
+            ]
+        ),
         vol.Required(CONF_DETAILED_LOGGING, default=False): bool,
     }
 )
 
+
 class FoxtrotPLCConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Foxtrot PLC."""
 
@@ -59,7 +82,9 @@ class FoxtrotPLCConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             options = {
                 CONF_SCAN_INTERVAL: user_input[CONF_SCAN_INTERVAL],
                 CONF_VARIABLE_PREFIXES: user_input[CONF_VARIABLE_PREFIXES],
-                CONF_EXCLUDE_VARIABLE_PREFIXES: user_input[CONF_EXCLUDE_VARIABLE_PREFIXES],
+                CONF_EXCLUDE_VARIABLE_PREFIXES: user_input[
+                    CONF_EXCLUDE_VARIABLE_PREFIXES
+                ],
                 CONF_LOG_LEVEL: user_input[CONF_LOG_LEVEL],
                 CONF_DETAILED_LOGGING: user_input[CONF_DETAILED_LOGGING],
             }
@@ -111,7 +136,9 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                     ): str,
                     vol.Optional(
                         CONF_EXCLUDE_VARIABLE_PREFIXES,
-                        default=options.get(CONF_EXCLUDE_VARIABLE_PREFIXES, ""),
+                        default=options.get(
+                            CONF_EXCLUDE_VARIABLE_PREFIXES, ""
+                        ),
                     ): str,
                     vol.Required(
                         CONF_IGNORE_ZERO,
@@ -120,16 +147,82 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                     vol.Required(
                         CONF_LOG_LEVEL,
                         default=options.get(CONF_LOG_LEVEL, LOG_LEVEL_INFO),
-                    ): vol.In([
-                        LOG_LEVEL_DEBUG,
-                        LOG_LEVEL_INFO,
-                        LOG_LEVEL_WARNING,
-                        LOG_LEVEL_ERROR,
-                    ]),
+                    ): vol.In(
+                        [
+                            LOG_LEVEL_DEBUG,
+                            LOG_LEVEL_INFO,
+                            LOG_LEVEL_WARNING,
+                            LOG_LEVEL_ERROR,
+                        ]
+                    ),
                     vol.Required(
                         CONF_DETAILED_LOGGING,
                         default=options.get(CONF_DETAILED_LOGGING, False),
                     ): bool,
+                    vol.Required(
+                        CONF_SUBSCRIPTION_MODE,
+                        default=options.get(CONF_SUBSCRIPTION_MODE, False),
+                    ): bool,
+                    vol.Required(
+                        CONF_RESYNC_INTERVAL,
+                        default=options.get(
+                            CONF_RESYNC_INTERVAL, DEFAULT_RESYNC_INTERVAL
+                        ),
+                    ): vol.All(int, vol.Range(min=0)),
+                    vol.Required(
+                        CONF_BATCH_SIZE,
+                        default=options.get(
+                            CONF_BATCH_SIZE, DEFAULT_BATCH_SIZE
+                        ),
+                    ): vol.All(int, vol.Range(min=1)),
+                    vol.Required(
+                        CONF_CATALOG_TTL,
+                        default=options.get(
+                            CONF_CATALOG_TTL, DEFAULT_CATALOG_TTL
+                        ),
+                    ): vol.All(int, vol.Range(min=0)),
+                    vol.Required(
+                        CONF_CONNECTIONS,
+                        default=options.get(
+                            CONF_CONNECTIONS, DEFAULT_CONNECTIONS
+                        ),
+                    ): vol.All(int, vol.Range(min=1, max=MAX_CONNECTIONS)),
+                    vol.Optional(
+                        CONF_SCAN_GROUPS,
+                        default=options.get(CONF_SCAN_GROUPS, ""),
+                    ): str,
+                    vol.Optional(
+                        CONF_WRITABLE_PREFIXES,
+                        default=options.get(CONF_WRITABLE_PREFIXES, ""),
+                    ): str,
+                    vol.Optional(
+                        CONF_SELECT_OPTIONS,
+                        default=options.get(CONF_SELECT_OPTIONS, ""),
+                    ): str,
+                    vol.Optional(
+                        CONF_DEADBANDS,
+                        default=options.get(CONF_DEADBANDS, ""),
+                    ): str,
+                    vol.Required(
+                        CONF_ADAPTIVE_INTERVAL,
+                        default=options.get(CONF_ADAPTIVE_INTERVAL, False),
+                    ): bool,
+                    vol.Required(
+                        CONF_MIN_SCAN_INTERVAL,
+                        default=options.get(
+                            CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL
+                        ),
+                    ): vol.All(int, vol.Range(min=1)),
+                    vol.Required(
+                        CONF_MAX_SCAN_INTERVAL,
+                        default=options.get(
+                            CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL
+                        ),
+                    ): vol.All(int, vol.Range(min=1)),
+                    vol.Optional(
+                        CONF_AGGREGATION,
+                        default=options.get(CONF_AGGREGATION, ""),
+                    ): str,
                 }
             ),
-        )
\ No newline at end of file
+        )
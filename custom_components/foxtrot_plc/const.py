@@ -8,7 +8,63 @@ CONF_VARIABLE_PREFIXES = "variable_prefixes"
 CONF_EXCLUDE_VARIABLE_PREFIXES = "exclude_variable_prefixes"
 CONF_IGNORE_ZERO = "ignore_zero_values"
 CONF_LOG_LEVEL = "log_level"
-CONF_DETAILED_LOGGING = "detailed_logging"  # New constant for detailed logging option
+# New constant for detailed logging option
+CONF_DETAILED_LOGGING = "detailed_logging"
+CONF_SUBSCRIPTION_MODE = "subscription_mode"
+CONF_RESYNC_INTERVAL = "resync_interval"
+CONF_BATCH_SIZE = "batch_size"
+CONF_CATALOG_TTL = "catalog_ttl"
+CONF_CONNECTIONS = "connections"
+CONF_SCAN_GROUPS = "scan_groups"
+CONF_WRITABLE_PREFIXES = "writable_prefixes"
+CONF_SELECT_OPTIONS = "select_options"
+CONF_DEADBANDS = "deadbands"
+CONF_ADAPTIVE_INTERVAL = "adaptive_interval"
+CONF_MIN_SCAN_INTERVAL = "min_scan_interval"
+CONF_MAX_SCAN_INTERVAL = "max_scan_interval"
+CONF_AGGREGATION = "aggregation"
+
+DEFAULT_RESYNC_INTERVAL = 300  # seconds, 0 disables the periodic resync
+SUBSCRIPTION_RETRY_DELAY = 10  # seconds
+DEFAULT_BATCH_SIZE = 100  # GET: commands written per pipelined window
+DEFAULT_CATALOG_TTL = 3600  # seconds between LIST: refreshes
+DEFAULT_CONNECTIONS = 1
+MAX_CONNECTIONS = 8
+
+SERVICE_GET_DIAGNOSTICS = "get_diagnostics"
+SERVICE_REFRESH_CATALOG = "refresh_catalog"
+SERVICE_SET_VARIABLE = "set_variable"
+SERVICE_SET_VARIABLES = "set_variables"
+SERVICE_DUMP_TRACE = "dump_trace"
+SERVICE_START_RECORDING = "start_recording"
+SERVICE_STOP_RECORDING = "stop_recording"
+
+WRITE_DEBOUNCE = 0.05  # seconds writes are collected before sending
+ENTITY_BATCH_SIZE = 200  # entities registered at once, between loop yields
+
+RECONNECT_MIN_DELAY = 1  # seconds before reconnecting after a connection fault
+RECONNECT_MAX_DELAY = 300  # seconds, upper bound of the reconnect back-off
+# Consecutive failed reads before a variable is held back
+QUARANTINE_THRESHOLD = 3
+# Seconds before a quarantined variable is read again
+QUARANTINE_MIN_DELAY = 60
+QUARANTINE_MAX_DELAY = 3600  # seconds, upper bound of the quarantine back-off
+# Seconds an abandoned response may block a connection
+STALLED_RESPONSE_TIMEOUT = 30
+
+DEFAULT_MIN_SCAN_INTERVAL = 5  # seconds, lower bound of the adaptive interval
+# Seconds, upper bound of the adaptive interval
+DEFAULT_MAX_SCAN_INTERVAL = 300
+# Samples held per aggregated variable and window
+AGGREGATION_MAX_SAMPLES = 1024
+MAX_CONCURRENT_REFRESHES = 4  # PLCs polled at once across all entries
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"
+
+STORAGE_VERSION = 1
+CACHE_SAVE_DELAY = 60  # seconds, coalesces cache writes between polls
+
+TRACE_CAPACITY = 1 << 20  # bytes of raw protocol traffic kept per connection
+RECORDING_FLUSH_SIZE = 1 << 18  # bytes collected before a recording is written
 
 LOG_LEVEL_DEBUG = "debug"
 LOG_LEVEL_INFO = "info"
@@ -19,4 +75,4 @@ DIAGNOSTIC_PLC_VERSION = "plc_version"
 DIAGNOSTIC_SERVER_VERSION = "server_version"
 DIAGNOSTIC_EPSNET_VERSION = "epsnet_version"
 DIAGNOSTIC_CONNECTED_CLIENTS = "connected_clients"
-DIAGNOSTIC_ACTIVE_VARIABLES = "active_variables"
\ No newline at end of file
+DIAGNOSTIC_ACTIVE_VARIABLES = "active_variables"
@@ -1,22 +1,79 @@
+import asyncio
 import logging
-import re
+import time
 from datetime import timedelta
 
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers import event
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import (
+    DataUpdateCoordinator,
+    UpdateFailed,
+)
 
-from .plccoms_client import PLCComsClient
+from .adaptive import AdaptiveInterval
+from .aggregation import STATISTICS, WindowAggregate
+from .catalog import (
+    INTEGER_TYPES,
+    REAL_TYPES,
+    VariableCatalog,
+    base_type,
+    decoder_for,
+)
 from .const import (
-    CONF_LOG_LEVEL,
-    CONF_DETAILED_LOGGING,
+    AGGREGATION_MAX_SAMPLES,
+    CACHE_SAVE_DELAY,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_CATALOG_TTL,
+    DEFAULT_CONNECTIONS,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DIAGNOSTIC_ACTIVE_VARIABLES,
+    DIAGNOSTIC_CONNECTED_CLIENTS,
+    DIAGNOSTIC_EPSNET_VERSION,
+    DIAGNOSTIC_PLC_VERSION,
+    DIAGNOSTIC_SERVER_VERSION,
+    DOMAIN,
     LOG_LEVEL_DEBUG,
+    LOG_LEVEL_ERROR,
     LOG_LEVEL_INFO,
     LOG_LEVEL_WARNING,
-    LOG_LEVEL_ERROR,
+    STORAGE_VERSION,
+    SUBSCRIPTION_RETRY_DELAY,
+    WRITE_DEBOUNCE,
 )
+from .matcher import PrefixMatcher, VariableFilter, parse_prefix_settings
+from .metadata import build_metadata
+from .metrics import RefreshMetrics
+from .plccoms_client import PLCComsPool
+from .scheduler import FoxtrotPLCScheduler
+from .trace import TraceRecorder, write_trace
+from .values import ValueStore
+from .write_queue import FoxtrotPLCWriteQueue
 
 _LOGGER = logging.getLogger(__name__)
 
+# Platforms of a variable by its value and writable platform
+_WRITABLE_PLATFORMS = {
+    None: frozenset(),
+    Platform.SWITCH: frozenset({Platform.SWITCH}),
+    Platform.NUMBER: frozenset({Platform.NUMBER}),
+    Platform.SELECT: frozenset({Platform.SELECT}),
+}
+_NO_PLATFORMS = _WRITABLE_PLATFORMS[None]
+_VALUE_PLATFORMS = {
+    writable: platforms | {Platform.SENSOR}
+    for writable, platforms in _WRITABLE_PLATFORMS.items()
+}
+_BOOL_PLATFORMS = {
+    writable: platforms | {Platform.BINARY_SENSOR}
+    for writable, platforms in _VALUE_PLATFORMS.items()
+}
+
+
 class FoxtrotPLCCoordinator(DataUpdateCoordinator):
     """Coordinator for Foxtrot PLC."""
 
@@ -31,25 +88,205 @@ class FoxtrotPLCCoordinator(DataUpdateCoordinator):
         ignore_zero: bool,
         log_level: str,
         detailed_logging: bool,
+        subscription_mode: bool = False,
+        resync_interval: int = 0,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        catalog_ttl: int = DEFAULT_CATALOG_TTL,
+        connections: int = DEFAULT_CONNECTIONS,
+        scan_groups: str = "",
+        writable_prefixes: str = "",
+        select_options: str = "",
+        deadbands: str = "",
+        adaptive_interval: bool = False,
+        min_scan_interval: int = DEFAULT_MIN_SCAN_INTERVAL,
+        max_scan_interval: int = DEFAULT_MAX_SCAN_INTERVAL,
+        aggregation: str = "",
+        scheduler: FoxtrotPLCScheduler | None = None,
     ) -> None:
         """Initialize the coordinator."""
+        self.scan_interval = scan_interval
+        self.scan_groups = self._parse_scan_groups(scan_groups)
+        if subscription_mode:
+            # Values arrive as DIFF: pushes, polling only resyncs the snapshot
+            update_interval = (
+                timedelta(seconds=resync_interval) if resync_interval else None
+            )
+        else:
+            # Tick at the fastest group rate, each tick polls the groups due
+            update_interval = timedelta(
+                seconds=min([scan_interval, *self.scan_groups.values()])
+            )
         super().__init__(
             hass,
             _LOGGER,
-            name="Foxtrot PLC",
-            update_interval=timedelta(seconds=scan_interval),
+            name=f"Foxtrot PLC {plc_ip}",
+            update_interval=update_interval,
+        )
+        self.scheduler = scheduler
+        # Options in effect, to tell what an update changes
+        self.entry_options = {}
+        if scheduler is not None:
+            scheduler.async_add(self)
+        self.client = PLCComsPool(plc_ip, plc_port, connections, batch_size)
+        self.subscription_mode = subscription_mode
+        if subscription_mode:
+            self.client.diff_callback = self._handle_diff
+        self.client.rejected_callback = self._handle_rejected
+        self.write_queue = FoxtrotPLCWriteQueue(
+            hass, self.client, WRITE_DEBOUNCE
         )
-        self.client = PLCComsClient(plc_ip, plc_port)
+        self._writable_matcher = PrefixMatcher(
+            prefix.strip()
+            for prefix in writable_prefixes.split(",")
+            if prefix.strip()
+        )
+        self.select_options = {
+            prefix: [option.strip() for option in options.split("|")]
+            for prefix, options in parse_prefix_settings(
+                select_options
+            ).items()
+        }
+        self._select_matcher = PrefixMatcher(self.select_options)
+        self.writable_variables = {}
+        self._entity_platforms = {}  # Platforms each variable has an entity on
+        self.deadbands = self._parse_deadbands(deadbands)
+        self._deadband_matcher = PrefixMatcher(self.deadbands)
+        self._variable_deadbands = {}
+        self.aggregations = self._parse_aggregations(aggregation)
+        self._aggregation_matcher = PrefixMatcher(self.aggregations)
+        self._aggregates = {}
+        self._aggregate_flush_handle = None
+        self._aggregate_flush_due = None
+        self._store = None
+        self._cache_save_due = 0.0
+        if self.config_entry is not None:
+            self._store = Store(
+                hass, STORAGE_VERSION, f"{DOMAIN}.{self.config_entry.entry_id}"
+            )
+        self._unsub_catalog_reload = None
+        self._written = {}  # Variable to (previous, written) value
+        self._subscription_task = None
+        self._subscribed_variables = frozenset()
+        self._pending_diffs = {}
+        self._diff_flush_handle = None
+        self._recorder = None
+        self.catalog = None
+        self.catalog_ttl = catalog_ttl
+        self._catalog_expires = 0.0
+        self._filtered_variables = []
+        self._filtered_version = None
+        self._decoders = {}
+        self._metadata = {}
+        self._group_matcher = PrefixMatcher(self.scan_groups)
+        self._group_members = {}
+        self._group_due = {}
+        # Adaptive intervals only make sense while polling
+        self.adaptive_interval = adaptive_interval and not subscription_mode
+        self.min_scan_interval = max(1, min_scan_interval)
+        self.max_scan_interval = max(self.min_scan_interval, max_scan_interval)
+        self._adaptive = {}
+        self._scheduled_refresh = False
+        self.values = ValueStore()
+        self._notified = False
+        self._notified_success = None
+        self.changed_count = 0
+        self.unchanged_count = 0
+        self.refresh_metrics = RefreshMetrics()
         self.variable_prefixes = [
-            prefix.strip() for prefix in variable_prefixes.split(",") if prefix.strip()
+            prefix.strip()
+            for prefix in variable_prefixes.split(",")
+            if prefix.strip()
         ]
         self.exclude_variable_prefixes = [
-            prefix.strip() for prefix in exclude_variable_prefixes.split(",") if prefix.strip()
+            prefix.strip()
+            for prefix in exclude_variable_prefixes.split(",")
+            if prefix.strip()
         ]
+        self._variable_filter = VariableFilter(
+            self.variable_prefixes, self.exclude_variable_prefixes
+        )
         self.ignore_zero = ignore_zero
         self.detailed_logging = detailed_logging
         self._set_log_level(log_level)
 
+    async def async_apply_options(
+        self,
+        scan_interval: int,
+        variable_prefixes: str,
+        exclude_variable_prefixes: str,
+        ignore_zero: bool,
+        log_level: str,
+        detailed_logging: bool,
+    ) -> None:
+        """Apply changed options in place, keeping the connection and entities.
+
+        A filter change is applied to the loaded catalog, so only the
+        entities of variables entering or leaving the filtered set are
+        added or removed. Variables that need a value are fetched by an
+        immediate refresh.
+        """
+        self._set_log_level(log_level)
+        self.detailed_logging = detailed_logging
+        refresh = False
+
+        if scan_interval != self.scan_interval:
+            self.scan_interval = scan_interval
+            if self.adaptive_interval:
+                # The default group learns again from the new interval
+                self._adaptive.pop(None, None)
+                self._assign_scan_groups(self._filtered_variables)
+            if not self.subscription_mode:
+                self.update_interval = timedelta(
+                    seconds=min([scan_interval, *self.scan_groups.values()])
+                )
+                if self._listeners:
+                    self._schedule_refresh()
+            _LOGGER.info(f"Scan interval changed to {scan_interval}s")
+
+        prefixes = [
+            prefix.strip()
+            for prefix in variable_prefixes.split(",")
+            if prefix.strip()
+        ]
+        exclude_prefixes = [
+            prefix.strip()
+            for prefix in exclude_variable_prefixes.split(",")
+            if prefix.strip()
+        ]
+        if (
+            prefixes != self.variable_prefixes
+            or exclude_prefixes != self.exclude_variable_prefixes
+        ):
+            self.variable_prefixes = prefixes
+            self.exclude_variable_prefixes = exclude_prefixes
+            self._variable_filter = VariableFilter(prefixes, exclude_prefixes)
+            self._filtered_version = None
+            if self.catalog is not None:
+                self._get_filtered_variables()
+            _LOGGER.info(
+                "Variable filters changed, "
+                f"{len(self._filtered_variables)} variables"
+            )
+            if self.subscription_mode and self.catalog is not None:
+                await self._async_update_subscription(self._filtered_variables)
+            refresh = True
+
+        if ignore_zero != self.ignore_zero:
+            self.ignore_zero = ignore_zero
+            if ignore_zero:
+                values = self.values
+                for var, value in list(values.items()):
+                    if not self._keep_value(var, value):
+                        values.discard(var)
+            else:
+                refresh = True  # Fetch the zero values dropped so far
+
+        if self.data is not None:
+            self.async_update_listeners()
+        if refresh:
+            # Not debounced, a second change in a row also needs its values
+            await self.async_refresh()
+
     def _set_log_level(self, log_level: str) -> None:
         """Set the log level based on the configuration."""
         if log_level == LOG_LEVEL_DEBUG:
@@ -62,81 +299,896 @@ class FoxtrotPLCCoordinator(DataUpdateCoordinator):
             _LOGGER.setLevel(logging.ERROR)
 
     async def _async_update_data(self):
-        """Fetch data from API endpoint."""
+        """Fetch data from API endpoint, within a shared refresh slot."""
+        if self.scheduler is None:
+            return await self._async_poll()
+        async with self.scheduler.refresh_slot(self):
+            return await self._async_poll()
+
+    async def _async_poll(self):
+        """Poll the PLC and return the published values."""
+        started = time.perf_counter()
+        received = self._bytes_received()
         try:
-            variables = await self.client.list_variables()
-            if self.detailed_logging:
-                _LOGGER.debug(f"Retrieved variables: {variables}")
-            else:
-                _LOGGER.debug(f"Retrieved {len(variables)} variables")
-            
-            filtered_variables = self._filter_variables(variables)
-            if self.detailed_logging:
-                _LOGGER.debug(f"Filtered variables: {filtered_variables}")
-            else:
-                _LOGGER.debug(f"Filtered to {len(filtered_variables)} variables")
-            
+            if (
+                self.catalog is None
+                or time.monotonic() >= self._catalog_expires
+            ):
+                await self.async_refresh_catalog()
+
+            filtered_variables = self._get_filtered_variables()
             if not filtered_variables:
-                _LOGGER.warning(f"No variables match the filters: include={self.variable_prefixes}, exclude={self.exclude_variable_prefixes}")
-                return {}
-            
-            data = await self.client.get_variables(filtered_variables)
-            if self.detailed_logging:
-                _LOGGER.debug(f"Retrieved data: {data}")
+                _LOGGER.warning(
+                    "No variables match the filters: "
+                    f"include={self.variable_prefixes}, "
+                    f"exclude={self.exclude_variable_prefixes}"
+                )
+                return self.values
+
+            now = time.monotonic()
+            due_groups = self._groups_to_poll(now)
+            polled = [
+                var
+                for group in due_groups
+                for var in self._group_members[group]
+            ]
+
+            data = await self.client.get_variables(polled)
+            if self.detailed_logging and _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("Retrieved data: %s", data)
             else:
-                _LOGGER.debug(f"Retrieved data for {len(data)} variables")
-
-            # Parse the values
-            parsed_data = {}
-            for var, value in data.items():
-                parsed_value = self._parse_value(value)
-                if not self.ignore_zero or not self._is_zero_or_empty(parsed_value):
-                    parsed_data[var] = parsed_value
-                    if self.detailed_logging:
-                        _LOGGER.debug(f"Parsed variable: {var} = {parsed_value}")
-                else:
-                    if self.detailed_logging:
-                        _LOGGER.debug(f"Ignored zero/empty variable: {var} = {parsed_value}")
+                _LOGGER.debug(
+                    "Retrieved data for %d of %d variables",
+                    len(data),
+                    len(polled),
+                )
+
+            # Update the values in place, groups that were not due keep theirs
+            group_changes = self._publish_groups(due_groups, data, now)
+            if self.adaptive_interval and self.data is not None:
+                self._adapt_intervals(
+                    group_changes, time.perf_counter() - started
+                )
+            for group in due_groups:
+                self._group_due[group] = now + self._group_interval(group)
+
+            self._schedule_cache_save()
 
-            _LOGGER.info(f"Update completed, {len(parsed_data)} variables processed")
-            return parsed_data
+            if self.subscription_mode:
+                await self._async_update_subscription(filtered_variables)
+            if self._aggregates:
+                self._schedule_aggregate_flush()
+
+            self.refresh_metrics.record(
+                time.perf_counter() - started,
+                len(polled),
+                self._bytes_received() - received,
+            )
+            _LOGGER.info(
+                f"Update completed, {len(polled)} variables polled, "
+                f"{len(self.values)} available"
+            )
+            return self.values
         except Exception as err:
+            self.refresh_metrics.failures += 1
             _LOGGER.error(f"Error communicating with PLC: {err}")
             raise UpdateFailed(f"Error communicating with PLC: {err}") from err
 
-    def _filter_variables(self, variables):
-        """Filter variables based on the prefixes and exclude prefixes."""
-        if not self.variable_prefixes and not self.exclude_variable_prefixes:
-            return variables
-
-        filtered = []
-        for variable in variables:
-            # Check if the variable should be excluded
-            if any(re.search(re.escape(prefix), variable, re.IGNORECASE) for prefix in self.exclude_variable_prefixes):
-                _LOGGER.debug(f"Variable {variable} excluded based on exclude prefixes")
+    def _publish_groups(self, groups, data: dict, now: float) -> dict:
+        """Publish the polled values of scan groups, return their changes."""
+        publish = self._publish_value
+        group_changes = {}
+        for group in groups:
+            changes = 0
+            for var in self._group_members[group]:
+                value = data.get(var)
+                if value is not None:
+                    # Failing and quarantined variables keep their last
+                    # value, it only goes when the catalog drops them
+                    changes += publish(var, value, now)
+            group_changes[group] = changes
+        return group_changes
+
+    def _publish_value(self, var: str, raw: str, now: float) -> bool:
+        """Decode and publish a received value, return True if it changed.
+
+        Values of aggregated variables only come out when their window
+        closes.
+        """
+        value = self._decode_value(var, raw)
+        aggregates = self._aggregates
+        if aggregates and var in aggregates:
+            value = self._aggregate(var, value, now)
+            if value is None:
+                return False
+        return self._store_value(var, value)
+
+    def _store_value(self, var: str, value) -> bool:
+        """Store a value unless the deadband or ignore_zero hold it back."""
+        values = self.values
+        if self._within_deadband(var, value, values.get(var)):
+            return False
+        if self._keep_value(var, value):
+            return values.set(var, value)
+        return values.discard(var)
+
+    def _schedule_refresh(self) -> None:
+        """Schedule the next refresh on this PLC's phase of the schedule."""
+        if self.scheduler is None or self.update_interval is None:
+            super()._schedule_refresh()
+            return
+        if self.config_entry and self.config_entry.pref_disable_polling:
+            return
+        self._async_unsub_refresh()
+        self._unsub_refresh = event.async_call_at(
+            self.hass,
+            self._job,
+            self.scheduler.next_refresh(
+                self, self.update_interval.total_seconds()
+            ),
+        )
+
+    async def _handle_refresh_interval(self, _now) -> None:
+        """Mark interval refreshes, which only poll the scan groups due."""
+        self._scheduled_refresh = True
+        await super()._handle_refresh_interval(_now)
+
+    async def async_refresh_catalog(self) -> None:
+        """Reload the variable catalog with LIST:."""
+        variables = await self.client.list_variables()
+        if self.detailed_logging:
+            _LOGGER.debug("Retrieved variables: %s", variables)
+        else:
+            _LOGGER.debug("Retrieved %d variables", len(variables))
+
+        catalog = VariableCatalog(variables)
+        if self.catalog is None or catalog.version != self.catalog.version:
+            _LOGGER.info(f"Variable catalog loaded, {len(catalog)} variables")
+            self.catalog = catalog
+        self._catalog_expires = time.monotonic() + self.catalog_ttl
+        if self.subscription_mode:
+            self._schedule_catalog_reload(self.catalog_ttl)
+
+    @callback
+    def _schedule_catalog_reload(self, delay: float) -> None:
+        """Reload the catalog after a delay, without waiting for a poll.
+
+        In subscription mode polls only resync, and not at all with a
+        resync interval of 0, so the catalog TTL needs its own timer.
+        """
+        if self._unsub_catalog_reload is not None:
+            self._unsub_catalog_reload()
+        self._unsub_catalog_reload = event.async_call_later(
+            self.hass,
+            max(delay, SUBSCRIPTION_RETRY_DELAY),
+            self._async_reload_catalog,
+        )
+
+    async def _async_reload_catalog(self, _now) -> None:
+        """Reload an expired catalog and follow it with the subscription."""
+        self._unsub_catalog_reload = None
+        try:
+            await self.async_refresh_catalog()
+            await self._async_update_subscription(
+                self._get_filtered_variables()
+            )
+        except Exception as err:
+            _LOGGER.warning(f"Error reloading the variable catalog: {err}")
+            self._schedule_catalog_reload(SUBSCRIPTION_RETRY_DELAY)
+            return
+        if self.data is not None:
+            self.async_update_listeners()
+
+    async def async_load_cache(self) -> bool:
+        """Restore catalog and last values saved by a previous run.
+
+        Returns True if there was a cache, so entities can be created
+        before the PLC has answered.
+        """
+        if self._store is None:
+            return False
+        cached = await self._store.async_load()
+        if not cached or not cached.get("catalog"):
+            return False
+
+        self.catalog = VariableCatalog(cached["catalog"])
+        self._catalog_expires = 0.0  # The live refresh lists again
+        if (
+            cached.get("variable_prefixes") == self.variable_prefixes
+            and cached.get("exclude_variable_prefixes")
+            == self.exclude_variable_prefixes
+        ):
+            # Same filters as when the cache was written, skip filtering
+            self._filtered_variables = cached["filtered_variables"]
+            self._apply_filtered_variables()
+        filtered = set(self._get_filtered_variables())
+        for var, value in cached["values"].items():
+            if var in filtered:
+                self.values.set(var, value)
+        self.data = self.values
+        self._sync_entities(self.values)
+        _LOGGER.info(
+            f"Restored {len(self.catalog)} variables and {len(self.data)} "
+            "values from cache"
+        )
+        return True
+
+    @callback
+    def _schedule_cache_save(self) -> None:
+        """Save the cache CACHE_SAVE_DELAY after the first unsaved update.
+
+        Store re-arms its delay on every call, so calling it on each poll
+        would postpone the write for as long as polls keep coming.
+        """
+        now = time.monotonic()
+        if self._store is None or now < self._cache_save_due:
+            return
+        self._cache_save_due = now + CACHE_SAVE_DELAY
+        self._store.async_delay_save(self._cache_data, CACHE_SAVE_DELAY)
+
+    @callback
+    def _cache_data(self) -> dict:
+        """Return the data to save in the cache."""
+        return {
+            "catalog": self.catalog.types if self.catalog else {},
+            "variable_prefixes": self.variable_prefixes,
+            "exclude_variable_prefixes": self.exclude_variable_prefixes,
+            "filtered_variables": self._filtered_variables,
+            "values": dict(self.values),
+        }
+
+    def _get_filtered_variables(self):
+        """Return the filtered variables, derived once per catalog version."""
+        if self._filtered_version != self.catalog.version:
+            self._filtered_variables = self._filter_variables(
+                self.catalog.names
+            )
+            self._apply_filtered_variables()
+        return self._filtered_variables
+
+    def _apply_filtered_variables(self):
+        """Derive the per-variable state of a new filtered variable set."""
+        self._filtered_version = self.catalog.version
+        self.values.assign(self._filtered_variables)
+        self.values.retain(self._filtered_variables)
+        self._assign_scan_groups(self._filtered_variables)
+        self._build_decoders(self._filtered_variables)
+        self._metadata = {}
+        self._classify_writable(self._filtered_variables)
+        filtered = set(self._filtered_variables)
+        self._remove_entities(
+            [var for var in self._entity_platforms if var not in filtered]
+        )
+        self._sync_entities(self.writable_variables)
+        self._variable_deadbands = {
+            var: self.deadbands[prefix]
+            for var in self._filtered_variables
+            if (prefix := self._deadband_matcher.match(var)) is not None
+        }
+        self._assign_aggregates(self._filtered_variables)
+        if self.detailed_logging:
+            _LOGGER.debug("Filtered variables: %s", self._filtered_variables)
+        else:
+            _LOGGER.debug(
+                "Filtered to %d variables", len(self._filtered_variables)
+            )
+
+    async def _async_update_subscription(self, variables) -> None:
+        """Keep the EN: subscription in line with the filtered variables."""
+        wanted = frozenset(variables)
+        removed = self._subscribed_variables - wanted
+        added = wanted - self._subscribed_variables
+        self._subscribed_variables = wanted
+        if removed:
+            await self.client.unsubscribe(removed)
+        if added:
+            # Absolute deadbands let the PLC suppress small changes itself
+            deltas = {
+                var: self._variable_deadbands[var][0]
+                for var in added
+                if self._variable_deadbands.get(var, (None,))[0]
+            }
+            await self.client.subscribe(added, deltas)
+        if self._subscription_task is None or self._subscription_task.done():
+            self._subscription_task = self.hass.async_create_background_task(
+                self._async_keep_subscription(),
+                "foxtrot_plc subscription",
+            )
+
+    async def _async_keep_subscription(self) -> None:
+        """Reconnect when the connection drops so DIFF: pushes keep coming.
+
+        The client registers its subscriptions again on every new connection.
+        """
+        while True:
+            try:
+                await self.client.connect()
+                await self.client.wait_closed()
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                _LOGGER.warning(f"Subscription connection failed: {err}")
+            _LOGGER.info(
+                f"Reconnecting subscription in {SUBSCRIPTION_RETRY_DELAY}s"
+            )
+            await asyncio.sleep(SUBSCRIPTION_RETRY_DELAY)
+
+    def _parse_scan_groups(self, scan_groups: str) -> dict[str, int]:
+        """Parse the "PREFIX=seconds" scan group option."""
+        groups = {}
+        for prefix, interval in parse_prefix_settings(scan_groups).items():
+            try:
+                groups[prefix] = max(1, int(interval))
+            except ValueError:
+                _LOGGER.warning(
+                    f"Ignoring scan group {prefix} "
+                    f"with invalid interval {interval}"
+                )
+        return groups
+
+    def _parse_deadbands(self, deadbands: str) -> dict[str, tuple]:
+        """Parse the "PREFIX=0.5, PREFIX2=2%" deadband option.
+
+        Returns (absolute, percent) per prefix, one of them None.
+        """
+        parsed = {}
+        for prefix, threshold in parse_prefix_settings(deadbands).items():
+            try:
+                if threshold.endswith("%"):
+                    parsed[prefix] = (None, abs(float(threshold[:-1])))
+                else:
+                    parsed[prefix] = (abs(float(threshold)), None)
+            except ValueError:
+                _LOGGER.warning(
+                    f"Ignoring deadband {prefix} "
+                    f"with invalid threshold {threshold}"
+                )
+        return parsed
+
+    def _parse_aggregations(self, aggregation: str) -> dict[str, tuple]:
+        """Parse the "PREFIX=mean/60, PREFIX2=max/300" aggregation option.
+
+        Returns (statistic, window in seconds) per prefix.
+        """
+        parsed = {}
+        for prefix, setting in parse_prefix_settings(aggregation).items():
+            statistic, _, window = setting.partition("/")
+            statistic = statistic.strip().lower()
+            try:
+                seconds = float(window)
+            except ValueError:
+                seconds = 0
+            if statistic not in STATISTICS or seconds <= 0:
+                _LOGGER.warning(
+                    f"Ignoring aggregation {prefix} "
+                    f"with invalid setting {setting}"
+                )
                 continue
-            
-            # If include prefixes are specified, check if the variable matches any
-            if self.variable_prefixes:
-                if any(re.search(re.escape(prefix), variable, re.IGNORECASE) for prefix in self.variable_prefixes):
-                    filtered.append(variable)
-                    _LOGGER.debug(f"Variable {variable} included based on include prefixes")
-            else:
-                # If no include prefixes are specified, include all non-excluded variables
-                filtered.append(variable)
-                _LOGGER.debug(f"Variable {variable} included (no include prefixes specified)")
+            parsed[prefix] = (statistic, seconds)
+        return parsed
+
+    def _assign_aggregates(self, variables) -> None:
+        """Give every variable matching an aggregation prefix its aggregate.
+
+        Variables that stay filtered keep their aggregate and its samples.
+        The ring holds one window of samples at the variable's scan
+        interval; DIFF: pushes can arrive faster and use the largest ring.
+        """
+        if not self.aggregations:
+            return
+        aggregates = {}
+        for var in variables:
+            prefix = self._aggregation_matcher.match(var)
+            if prefix is None:
+                continue
+            aggregate = self._aggregates.get(var)
+            if aggregate is None:
+                statistic, window = self.aggregations[prefix]
+                if self.subscription_mode:
+                    capacity = AGGREGATION_MAX_SAMPLES
+                else:
+                    interval = self._group_interval(
+                        self._group_matcher.match(var)
+                    )
+                    if self.adaptive_interval:
+                        interval = min(interval, self.min_scan_interval)
+                    capacity = min(
+                        AGGREGATION_MAX_SAMPLES, int(window / interval) + 1
+                    )
+                aggregate = WindowAggregate(statistic, window, capacity)
+            aggregates[var] = aggregate
+        self._aggregates = aggregates
+
+    def _aggregate(self, var: str, value, now: float):
+        """Add a number to its variable's window, return what to publish.
+
+        Returns None while the window is open. Values that are not numbers
+        are published as they are.
+        """
+        if type(value) is not int and type(value) is not float:
+            return value
+        return self._aggregates[var].add(value, now)
+
+    @callback
+    def _schedule_aggregate_flush(self) -> None:
+        """Close aggregation windows when they end, even without new samples.
+
+        Pushed values stop arriving once a signal settles, so the window
+        holding its last samples would otherwise never be published.
+        """
+        due = min(
+            (
+                aggregate.window_end
+                for aggregate in self._aggregates.values()
+                if aggregate.pending
+            ),
+            default=None,
+        )
+        if due is None or (
+            self._aggregate_flush_handle is not None
+            and self._aggregate_flush_due <= due
+        ):
+            return
+        if self._aggregate_flush_handle is not None:
+            self._aggregate_flush_handle.cancel()
+        self._aggregate_flush_due = due
+        self._aggregate_flush_handle = self.hass.loop.call_later(
+            max(0.0, due - time.monotonic()), self._flush_aggregates
+        )
+
+    @callback
+    def _flush_aggregates(self) -> None:
+        """Publish the aggregation windows that have ended."""
+        self._aggregate_flush_handle = None
+        now = time.monotonic()
+        changed = False
+        for var, aggregate in self._aggregates.items():
+            value = aggregate.flush(now)
+            if value is not None:
+                changed |= self._store_value(var, value)
+        if changed and self.data is not None:
+            self.async_update_listeners()
+        self._schedule_aggregate_flush()
+
+    def get_aggregate_attributes(self, var: str) -> dict | None:
+        """Return the window summary of an aggregated variable."""
+        aggregate = self._aggregates.get(var)
+        return aggregate.attributes() if aggregate is not None else None
+
+    def _within_deadband(self, var: str, value, published) -> bool:
+        """Return True if a new value is too close to the published one."""
+        deadband = self._variable_deadbands.get(var)
+        if (
+            deadband is None
+            or not isinstance(value, (int, float))
+            or not isinstance(published, (int, float))
+            or isinstance(value, bool)
+        ):
+            return False
+        absolute, percent = deadband
+        threshold = (
+            absolute
+            if absolute is not None
+            else abs(published) * percent / 100
+        )
+        return abs(value - published) < threshold
+
+    def _group_interval(self, group) -> float:
+        """Return the poll interval of a scan group, None is the default."""
+        adaptive = self._adaptive.get(group)
+        if adaptive is not None:
+            return adaptive.interval
+        return self.scan_interval if group is None else self.scan_groups[group]
+
+    def _adapt_intervals(self, group_changes, duration) -> None:
+        """Tune the intervals of the polled groups and the timer tick."""
+        for group, changed in group_changes.items():
+            self._adaptive[group].observe(
+                changed, len(self._group_members[group]), duration
+            )
+
+        tick = min(adaptive.interval for adaptive in self._adaptive.values())
+        if self.update_interval.total_seconds() != tick:
+            _LOGGER.debug("Adaptive scan interval now %.1fs", tick)
+            self.update_interval = timedelta(seconds=tick)
+
+    def _assign_scan_groups(self, variables) -> None:
+        """Split variables into scan groups by their first matching prefix."""
+        members = {None: []}
+        for var in variables:
+            members.setdefault(self._group_matcher.match(var), []).append(var)
+        self._group_members = members
+        self._group_due = {}  # Poll everything once after a catalog change
+        if self.adaptive_interval:
+            # Groups that survive a catalog change keep their learned interval
+            self._adaptive = {
+                group: self._adaptive.get(group)
+                or AdaptiveInterval(
+                    (
+                        self.scan_interval
+                        if group is None
+                        else self.scan_groups[group]
+                    ),
+                    self.min_scan_interval,
+                    self.max_scan_interval,
+                )
+                for group in members
+            }
+
+    def _groups_to_poll(self, now: float) -> list:
+        """Return the scan groups a refresh polls."""
+        scheduled, self._scheduled_refresh = self._scheduled_refresh, False
+        if self.subscription_mode or not scheduled:
+            # Resyncs and requested refreshes fetch every group
+            return list(self._group_members)
+        return self._due_scan_groups(now)
+
+    def _due_scan_groups(self, now: float) -> list:
+        """Return the scan groups whose interval has elapsed."""
+        # Half a tick of slack, so timer jitter does not skip a whole tick
+        slack = self.update_interval.total_seconds() / 2
+        return [
+            group
+            for group in self._group_members
+            if self._group_due.get(group, 0.0) <= now + slack
+        ]
+
+    @callback
+    def _handle_diff(self, variable: str, value: str) -> None:
+        """Queue a DIFF: value; pushes arriving together are published once."""
+        self._pending_diffs[variable] = value
+        if self._diff_flush_handle is None:
+            self._diff_flush_handle = self.hass.loop.call_soon(
+                self._flush_diffs
+            )
+
+    @callback
+    def _flush_diffs(self) -> None:
+        """Merge queued DIFF: values into the coordinator data."""
+        self._diff_flush_handle = None
+        pending, self._pending_diffs = self._pending_diffs, {}
+        publish = self._publish_value
+        decoders = self._decoders
+        now = time.monotonic()
+        for var, value in pending.items():
+            if var in decoders:  # Not if it left the filter before its DI:
+                publish(var, value, now)
+        # Publish without rescheduling, resyncs and catalog reloads still run
+        self.data = self.values
+        # Pushes arriving show the PLC is reachable after a failed resync
+        self.last_update_success = True
+        self.async_update_listeners()
+        self._schedule_cache_save()
+        if self._aggregates:
+            self._schedule_aggregate_flush()
+
+    async def async_shutdown(self) -> None:
+        """Stop the subscription and close the PLC connections."""
+        await super().async_shutdown()
+        if self.scheduler is not None:
+            self.scheduler.async_remove(self)
+        await self.write_queue.async_shutdown()
+        if self._diff_flush_handle is not None:
+            self._diff_flush_handle.cancel()
+            self._diff_flush_handle = None
+        if self._aggregate_flush_handle is not None:
+            self._aggregate_flush_handle.cancel()
+            self._aggregate_flush_handle = None
+        if self._unsub_catalog_reload is not None:
+            self._unsub_catalog_reload()
+            self._unsub_catalog_reload = None
+        if self._subscription_task is not None:
+            self._subscription_task.cancel()
+            self._subscription_task = None
+        await self.async_stop_recording()
+        await self.client.disconnect()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the listeners whose variable changed since the last update.
+
+        Entities register with their variable name as listener context;
+        listeners without a context, and every listener when availability
+        changes, are always called.
+        """
+        values = self.values
+        changed = set(values.pop_changed())
+        self._sync_entities(changed)
+        if (
+            not self._notified
+            or self.last_update_success != self._notified_success
+        ):
+            self._notified = True
+            self._notified_success = self.last_update_success
+            self.changed_count = len(values)
+            self.unchanged_count = 0
+            super().async_update_listeners()
+            return
+
+        self.changed_count = len(changed)
+        self.unchanged_count = len(values) - sum(
+            var in values for var in changed
+        )
+        _LOGGER.debug(
+            "%d variables changed, %d unchanged",
+            self.changed_count,
+            self.unchanged_count,
+        )
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or context in changed:
+                update_callback()
+
+    def entity_unique_id(self, var: str) -> str:
+        """Return the unique ID of the entities of a variable."""
+        return f"{self.config_entry.entry_id}_{var}"
+
+    def entity_signal(self, platform: Platform) -> str:
+        """Return the dispatcher signal announcing new platform entities."""
+        return f"{DOMAIN}_{self.config_entry.entry_id}_{platform}_entities"
+
+    def entity_variables(self, platform: Platform) -> list[str]:
+        """Return the variables that have an entity on a platform."""
+        return [
+            var
+            for var, platforms in self._entity_platforms.items()
+            if platform in platforms
+        ]
 
-        return filtered
+    def _platforms_of(self, var: str) -> frozenset:
+        """Return the platforms a variable needs an entity on."""
+        value = self.values.get(var)
+        writable = self.writable_variables.get(var)
+        if value is None:
+            return _WRITABLE_PLATFORMS[writable]
+        if isinstance(value, bool):
+            return _BOOL_PLATFORMS[writable]
+        return _VALUE_PLATFORMS[writable]
+
+    def _sync_entities(self, variables) -> None:
+        """Announce the entities that variables need and do not have yet.
+
+        A variable gets its sensor once it first has a value, so variables
+        left out by ignore_zero are added when they become non-zero. Each
+        platform adds the announced variables in batches.
+        """
+        announced = self._entity_platforms
+        added = {}
+        for var in variables:
+            platforms = self._platforms_of(var)
+            known = announced.get(var, _NO_PLATFORMS)
+            if platforms <= known:
+                continue
+            announced[var] = known | platforms
+            for platform in platforms - known:
+                added.setdefault(platform, []).append(var)
+        if not added or self.config_entry is None:
+            return
+        for platform, new_variables in added.items():
+            _LOGGER.debug("%d new %s entities", len(new_variables), platform)
+            async_dispatcher_send(
+                self.hass, self.entity_signal(platform), new_variables
+            )
+
+    def _remove_entities(self, variables) -> None:
+        """Remove the entities of variables that left the filtered set."""
+        if not variables:
+            return
+        registry = er.async_get(self.hass) if self.config_entry else None
+        for var in variables:
+            platforms = self._entity_platforms.pop(var, ())
+            if registry is None:
+                continue
+            for platform in platforms:
+                entity_id = registry.async_get_entity_id(
+                    platform, DOMAIN, self.entity_unique_id(var)
+                )
+                if entity_id is not None:
+                    registry.async_remove(entity_id)
+        _LOGGER.info(f"Removed the entities of {len(variables)} variables")
+
+    def _filter_variables(self, variables):
+        """Filter variables based on the prefixes and exclude prefixes."""
+        return self._variable_filter.filter(variables)
 
     def _parse_data(self, data):
         """Parse the values into appropriate types."""
         parsed_data = {}
         for var, value in data.items():
-            parsed_value = self._parse_value(value)
-            if not self.ignore_zero or not self._is_zero_or_empty(parsed_value):
+            parsed_value = self._decode_value(var, value)
+            if self._keep_value(var, parsed_value):
                 parsed_data[var] = parsed_value
         return parsed_data
 
+    def _build_decoders(self, variables) -> None:
+        """Pick a value decoder per variable from its PLC type."""
+        types = self.catalog.types
+        self._decoders = {}
+        for var in variables:
+            decoder = decoder_for(types.get(var, ""))
+            if decoder is None:
+                # Unknown type, guess from the value
+                decoder = self._parse_value
+            self._decoders[var] = decoder
+
+    def _bytes_received(self) -> int:
+        """Return the bytes received on all connections so far."""
+        return sum(
+            client.metrics.bytes_received for client in self.client.clients
+        )
+
+    def get_metrics(self) -> dict:
+        """Return the connection and refresh counters."""
+        return {
+            "refresh": self.refresh_metrics.as_dict(),
+            "connection": self.client.metrics.as_dict(),
+            "changed_variables": self.changed_count,
+            "unchanged_variables": self.unchanged_count,
+            "update_interval": (
+                self.update_interval.total_seconds()
+                if self.update_interval
+                else None
+            ),
+            "scheduler": self.scheduler.load(self) if self.scheduler else None,
+            "adaptive_intervals": {
+                group or "default": adaptive.as_dict()
+                for group, adaptive in self._adaptive.items()
+            },
+            "aggregated_variables": len(self._aggregates),
+            "quarantine": self.client.quarantine.as_dict(),
+            "reconnect_backoff": [
+                client.backoff.as_dict() for client in self.client.clients
+            ],
+            "trace": {
+                "entries": sum(len(trace) for trace in self.client.traces),
+                "bytes": sum(trace.size for trace in self.client.traces),
+                "dropped": sum(trace.dropped for trace in self.client.traces),
+                "recording": self.recording,
+            },
+        }
+
+    def _trace_header(self) -> dict:
+        """Return the description of this PLC written into trace files."""
+        primary = self.client.primary
+        return {
+            "host": primary.host,
+            "port": primary.port,
+            "connections": len(self.client.clients),
+        }
+
+    async def async_dump_trace(self, path: str) -> int:
+        """Write the protocol traces of all connections to a file."""
+        count = await self.hass.async_add_executor_job(
+            write_trace, path, self.client.traces, self._trace_header()
+        )
+        _LOGGER.info(f"Wrote {count} protocol trace entries to {path}")
+        return count
+
+    @property
+    def recording(self) -> str | None:
+        """Return the file the session is recorded to, if any."""
+        return self._recorder.path if self._recorder is not None else None
+
+    async def async_start_recording(self, path: str) -> None:
+        """Record the whole session to a capture file until stopped.
+
+        The catalog is listed again first, so the capture holds the LIST:
+        response a replay needs.
+        """
+        await self.async_stop_recording()
+        recorder = TraceRecorder(path, self._trace_header())
+        await recorder.async_start()
+        self._recorder = recorder
+        self.client.start_recording(recorder)
+        _LOGGER.info(f"Recording PLC session to {path}")
+        await self.async_refresh_catalog()
+
+    async def async_stop_recording(self) -> int:
+        """Stop recording and return the number of entries captured."""
+        recorder, self._recorder = self._recorder, None
+        if recorder is None:
+            return 0
+        self.client.stop_recording()
+        await recorder.async_stop()
+        _LOGGER.info(
+            f"Recorded {recorder.entries} entries, {recorder.size} bytes, "
+            f"to {recorder.path}"
+        )
+        return recorder.entries
+
+    def get_metadata(self, var: str):
+        """Return the shared sensor metadata of a variable."""
+        metadata = self._metadata.get(var)
+        if metadata is None:
+            plc_type = self.catalog.types.get(var, "") if self.catalog else ""
+            metadata = build_metadata(var, plc_type, self.values.get(var))
+            self._metadata[var] = metadata
+        return metadata
+
+    def _classify_writable(self, variables) -> None:
+        """Pick the writable platform of each variable, if any."""
+        types = self.catalog.types
+        writable = {}
+        for var in variables:
+            plc_type = base_type(types.get(var, ""))
+            if self._select_matcher and plc_type in INTEGER_TYPES:
+                if self._select_matcher.match(var) is not None:
+                    writable[var] = Platform.SELECT
+                    continue
+            if not self._writable_matcher.matches(var):
+                continue
+            if plc_type == "BOOL":
+                writable[var] = Platform.SWITCH
+            elif plc_type in INTEGER_TYPES or plc_type in REAL_TYPES:
+                writable[var] = Platform.NUMBER
+        self.writable_variables = writable
+
+    def get_select_options(self, var: str) -> list[str]:
+        """Return the option labels of a select variable, by value."""
+        return self.select_options[self._select_matcher.match(var)]
+
+    def encode_value(self, value) -> str:
+        """Encode a value for a SET: command."""
+        if isinstance(value, bool):
+            return "1" if value else "0"
+        return str(value)
+
+    async def async_set_variables(self, values: dict) -> None:
+        """Write variables through the write queue, publishing them at once.
+
+        The values shown before the write come back if it fails, or if the
+        PLC rejects it later with an ERROR:SET.
+        """
+        encoded = {
+            var: self.encode_value(value) for var, value in values.items()
+        }
+        previous = {}
+        for var, value in encoded.items():
+            if var in self._decoders:  # Only variables that are published
+                decoded = self._decode_value(var, value)
+                previous[var] = self.values.get(var)
+                self._written[var] = (previous[var], decoded)
+                self.values.set(var, decoded)
+        # Publish without rescheduling the next poll
+        self.data = self.values
+        self.async_update_listeners()
+        try:
+            await self.write_queue.async_write(encoded)
+        except Exception:
+            self._restore_values(previous)
+            raise
+
+    @callback
+    def _handle_rejected(self, command: str, var: str) -> None:
+        """Take back a written value the PLC rejected."""
+        if command != "SET":
+            return
+        written = self._written.pop(var, None)
+        if written is None:
+            return
+        previous, value = written
+        if self.values.get(var) == value:
+            self._restore_values({var: previous})
+
+    @callback
+    def _restore_values(self, previous: dict) -> None:
+        """Publish the values variables had before a failed write."""
+        values = self.values
+        for var, value in previous.items():
+            self._written.pop(var, None)
+            if value is None:
+                values.discard(var)
+            else:
+                values.set(var, value)
+        self.data = values
+        self.async_update_listeners()
+
+    def _decode_value(self, var: str, value: str):
+        """Decode a raw value with the variable's type decoder."""
+        try:
+            return self._decoders.get(var, self._parse_value)(value)
+        except ValueError:
+            return value  # Malformed for its type, keep as string
+
     def _parse_value(self, value):
         """Parse the value into the appropriate type."""
         try:
@@ -149,6 +1201,17 @@ class FoxtrotPLCCoordinator(DataUpdateCoordinator):
         except ValueError:
             return value  # Keep as string if can't parse
 
+    def _keep_value(self, var: str, value) -> bool:
+        """Return False for zero values that ignore_zero drops.
+
+        Writable variables are always kept, their entities need the off state.
+        """
+        return (
+            not self.ignore_zero
+            or var in self.writable_variables
+            or not self._is_zero_or_empty(value)
+        )
+
     def _is_zero_or_empty(self, value):
         """Check if a value is zero or empty."""
         if isinstance(value, (int, float)):
@@ -162,31 +1225,27 @@ class FoxtrotPLCCoordinator(DataUpdateCoordinator):
         """Get diagnostic information from the PLC."""
         try:
             _LOGGER.debug("Fetching diagnostic information")
-            plc_info = await self.client.send_command("GETINFO:")
-            info_lines = plc_info.split("\n")
             diagnostics = {}
-            
-            for line in info_lines:
-                if ":" in line:
-                    key, value = line.split(":", 1)
-                    key = key.strip()
-                    value = value.strip()
-                    if key == "VERSION_PLC":
-                        diagnostics[DIAGNOSTIC_PLC_VERSION] = value
-                    elif key == "VERSION":
-                        diagnostics[DIAGNOSTIC_SERVER_VERSION] = value
-                    elif key == "VERSION_EPSNET":
-                        diagnostics[DIAGNOSTIC_EPSNET_VERSION] = value
-                    elif key == "NETWORK":
-                        if DIAGNOSTIC_CONNECTED_CLIENTS not in diagnostics:
-                            diagnostics[DIAGNOSTIC_CONNECTED_CLIENTS] = []
-                        diagnostics[DIAGNOSTIC_CONNECTED_CLIENTS].append(value)
+            for key, value in await self.client.get_info():
+                if key == "VERSION_PLC":
+                    diagnostics[DIAGNOSTIC_PLC_VERSION] = value
+                elif key == "VERSION":
+                    diagnostics[DIAGNOSTIC_SERVER_VERSION] = value
+                elif key == "VERSION_EPSNET":
+                    diagnostics[DIAGNOSTIC_EPSNET_VERSION] = value
+                elif key == "NETWORK":
+                    diagnostics.setdefault(
+                        DIAGNOSTIC_CONNECTED_CLIENTS, []
+                    ).append(value)
 
             active_vars = await self.client.send_command("EN:")
-            diagnostics[DIAGNOSTIC_ACTIVE_VARIABLES] = active_vars.split(":")[1].strip()
+            diagnostics[DIAGNOSTIC_ACTIVE_VARIABLES] = active_vars.split(":")[
+                1
+            ].strip()
+            diagnostics["metrics"] = self.get_metrics()
 
             _LOGGER.info("Diagnostic information retrieved successfully")
             return diagnostics
         except Exception as err:
             _LOGGER.error(f"Error retrieving diagnostic information: {err}")
-            raise
\ No newline at end of file
+            raise
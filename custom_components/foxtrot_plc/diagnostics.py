@@ -0,0 +1,50 @@
+"""Diagnostics support for Foxtrot PLC."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_PLC_IP, DATA_SCHEDULER, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+TO_REDACT = {CONF_PLC_IP}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    try:
+        plc = await coordinator.get_diagnostics()
+        plc.pop("metrics", None)
+    except Exception as err:
+        # The counters are still worth downloading while the PLC is down
+        _LOGGER.debug("PLC information not available for diagnostics: %s", err)
+        plc = {"error": str(err)}
+
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "plc": plc,
+        "metrics": coordinator.get_metrics(),
+        "catalog": {
+            "variables": (
+                len(coordinator.catalog) if coordinator.catalog else 0
+            ),
+            "version": (
+                coordinator.catalog.version if coordinator.catalog else None
+            ),
+            "published": len(coordinator.data or {}),
+        },
+        "last_update_success": coordinator.last_update_success,
+        "fleet": hass.data[DATA_SCHEDULER].report(),
+    }
@@ -0,0 +1,123 @@
+"""Base entity for the Foxtrot PLC integration."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity_platform import async_get_current_platform
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN, ENTITY_BATCH_SIZE
+from .coordinator import FoxtrotPLCCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class FoxtrotPLCEntity(CoordinatorEntity[FoxtrotPLCCoordinator]):
+    """Base class for entities backed by a single PLC variable.
+
+    The variable name is the coordinator listener context, so the entity
+    is only woken when its own value changes. The value is read from the
+    variable's slot in the coordinator's value store.
+    """
+
+    def __init__(
+        self, coordinator: FoxtrotPLCCoordinator, variable: str
+    ) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator, context=variable)
+        self._variable = variable
+        self._slot = coordinator.values.slot(variable)
+        self._attr_unique_id = coordinator.entity_unique_id(variable)
+        self._attr_name = f"Foxtrot PLC {variable}"
+
+    @property
+    def _value(self):
+        """Return the current value of the variable, None if it has none."""
+        return self.coordinator.values.value_at(self._slot)
+
+
+class _VariableEntityAdder:
+    """Adds the entities of one platform in bounded batches.
+
+    Every batch is awaited before the next one is built, so a catalog of
+    thousands of variables is registered in small steps with the event
+    loop free in between, instead of in one long burst.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        coordinator: FoxtrotPLCCoordinator,
+        platform: Platform,
+        factory: Callable[[FoxtrotPLCCoordinator, str], FoxtrotPLCEntity],
+    ) -> None:
+        """Initialize the adder for the current entity platform."""
+        self._hass = hass
+        self._config_entry = config_entry
+        self._coordinator = coordinator
+        self._platform = platform
+        self._entity_platform = async_get_current_platform()
+        self._factory = factory
+        self._pending = []
+        self._task = None
+
+    @callback
+    def add(self, variables: list[str]) -> None:
+        """Queue variables whose entities are to be added."""
+        self._pending.extend(variables)
+        if self._task is None and self._pending:
+            self._task = self._config_entry.async_create_background_task(
+                self._hass,
+                self._async_add_pending(),
+                f"{DOMAIN} {self._config_entry.entry_id} add {self._platform}",
+            )
+
+    async def _async_add_pending(self) -> None:
+        """Add the queued entities, one batch at a time."""
+        try:
+            while self._pending:
+                batch = self._pending[:ENTITY_BATCH_SIZE]
+                del self._pending[:ENTITY_BATCH_SIZE]
+                _LOGGER.debug(
+                    "Adding %d %s entities", len(batch), self._platform
+                )
+                await self._entity_platform.async_add_entities(
+                    [
+                        self._factory(self._coordinator, variable)
+                        for variable in batch
+                    ]
+                )
+        finally:
+            self._task = None
+
+
+@callback
+def async_setup_variable_entities(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    platform: Platform,
+    factory: Callable[[FoxtrotPLCCoordinator, str], FoxtrotPLCEntity],
+) -> None:
+    """Add the variable entities of a platform, now and as variables appear.
+
+    Must be called from the platform's async_setup_entry. Variables the
+    coordinator announces later, e.g. after a catalog change or when an
+    ignored zero value becomes non-zero, are added without a reload.
+    """
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    adder = _VariableEntityAdder(
+        hass, config_entry, coordinator, platform, factory
+    )
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, coordinator.entity_signal(platform), adder.add
+        )
+    )
+    adder.add(coordinator.entity_variables(platform))
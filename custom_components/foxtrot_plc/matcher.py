@@ -0,0 +1,84 @@
+"""Variable name matching for the Foxtrot PLC integration."""
+
+from __future__ import annotations
+
+import re
+
+
+class PrefixMatcher:
+    """Case-insensitive substring matcher compiled from a prefix list.
+
+    All prefixes are folded into one alternation regex, so matching a name
+    costs a single regex scan no matter how many prefixes are configured.
+    """
+
+    def __init__(self, prefixes) -> None:
+        """Compile the matcher."""
+        self.prefixes = list(prefixes)
+        self._by_text = {prefix.lower(): prefix for prefix in self.prefixes}
+        self._pattern = None
+        if self.prefixes:
+            # Longest first, so a prefix never shadows a longer one it starts
+            alternatives = sorted(self._by_text, key=len, reverse=True)
+            self._pattern = re.compile(
+                "|".join(re.escape(prefix) for prefix in alternatives),
+                re.IGNORECASE,
+            )
+
+    def __bool__(self) -> bool:
+        """Return True if any prefixes are configured."""
+        return self._pattern is not None
+
+    def matches(self, name: str) -> bool:
+        """Return True if any prefix occurs in the name."""
+        return (
+            self._pattern is not None
+            and self._pattern.search(name) is not None
+        )
+
+    def match(self, name: str) -> str | None:
+        """Return the configured prefix found first in the name, if any."""
+        if self._pattern is None:
+            return None
+        found = self._pattern.search(name)
+        if found is None:
+            return None
+        return self._by_text[found.group(0).lower()]
+
+
+def parse_prefix_settings(text: str) -> dict[str, str]:
+    """Parse "PREFIX=value, PREFIX2=value2" into a prefix to value mapping.
+
+    Entries without a value or an empty prefix are skipped.
+    """
+    settings = {}
+    for item in text.split(","):
+        prefix, _, value = item.partition("=")
+        prefix = prefix.strip()
+        value = value.strip()
+        if prefix and value:
+            settings[prefix] = value
+    return settings
+
+
+class VariableFilter:
+    """Include/exclude filter for PLC variable names."""
+
+    def __init__(self, include, exclude) -> None:
+        """Initialize the filter from include and exclude prefixes."""
+        self.include = PrefixMatcher(include)
+        self.exclude = PrefixMatcher(exclude)
+
+    def filter(self, variables) -> list[str]:
+        """Return the variables that pass the filter, in order."""
+        if not self.include and not self.exclude:
+            return list(variables)
+        if not self.include:
+            return [var for var in variables if not self.exclude.matches(var)]
+        if not self.exclude:
+            return [var for var in variables if self.include.matches(var)]
+        return [
+            var
+            for var in variables
+            if self.include.matches(var) and not self.exclude.matches(var)
+        ]
@@ -0,0 +1,108 @@
+"""Per-variable sensor metadata for the Foxtrot PLC integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
+from homeassistant.const import (
+    PERCENTAGE,
+    UnitOfEnergy,
+    UnitOfPower,
+    UnitOfTemperature,
+)
+
+from .catalog import INTEGER_TYPES, REAL_TYPES, base_type, decoder_for
+
+# (name keywords, device class, unit, state class), first match wins
+_NAME_RULES = (
+    (
+        ("temp", "teploty"),
+        SensorDeviceClass.TEMPERATURE,
+        UnitOfTemperature.CELSIUS,
+        SensorStateClass.MEASUREMENT,
+    ),
+    (
+        ("humidity", "vlhkost"),
+        SensorDeviceClass.HUMIDITY,
+        PERCENTAGE,
+        SensorStateClass.MEASUREMENT,
+    ),
+    (
+        ("power", "vykon"),
+        SensorDeviceClass.POWER,
+        UnitOfPower.WATT,
+        SensorStateClass.MEASUREMENT,
+    ),
+    (
+        ("energy", "energie"),
+        SensorDeviceClass.ENERGY,
+        UnitOfEnergy.KILO_WATT_HOUR,
+        SensorStateClass.TOTAL_INCREASING,
+    ),
+)
+
+
+class VariableMetadata:
+    """How a PLC variable is presented as a sensor."""
+
+    __slots__ = ("device_class", "unit", "state_class", "numeric")
+
+    def __init__(
+        self,
+        device_class: SensorDeviceClass | None,
+        unit: str | None,
+        state_class: SensorStateClass | None,
+        numeric: bool,
+    ) -> None:
+        """Initialize the metadata."""
+        self.device_class = device_class
+        self.unit = unit
+        self.state_class = state_class
+        self.numeric = numeric
+
+
+# Variables with the same presentation share one instance
+_INTERNED: dict[tuple, VariableMetadata] = {}
+
+
+def is_numeric_type(plc_type: str, value: Any) -> bool:
+    """Return True if a variable holds numbers.
+
+    The PLC type decides; the current value is only checked for types the
+    integration does not know.
+    """
+    plc_type = base_type(plc_type)
+    if plc_type in INTEGER_TYPES or plc_type in REAL_TYPES:
+        return True
+    if decoder_for(plc_type) is not None:
+        return False
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def build_metadata(
+    variable: str, plc_type: str, value: Any
+) -> VariableMetadata:
+    """Work out the sensor metadata of a variable from its type and name."""
+    numeric = is_numeric_type(plc_type, value)
+    device_class = unit = state_class = None
+    lower_var = variable.lower()
+    for keywords, rule_class, rule_unit, rule_state in _NAME_RULES:
+        if any(keyword in lower_var for keyword in keywords):
+            if rule_class is SensorDeviceClass.TEMPERATURE:
+                # Temperatures keep their unit even for non-numeric values
+                device_class, unit = rule_class, rule_unit
+                state_class = rule_state if numeric else None
+            elif numeric:
+                device_class, unit, state_class = (
+                    rule_class,
+                    rule_unit,
+                    rule_state,
+                )
+            break
+
+    key = (device_class, unit, state_class, numeric)
+    metadata = _INTERNED.get(key)
+    if metadata is None:
+        metadata = _INTERNED[key] = VariableMetadata(*key)
+    return metadata
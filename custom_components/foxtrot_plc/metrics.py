@@ -0,0 +1,231 @@
+"""Running counters and latency histograms for the PLCComS connection."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+
+# Upper bounds of the latency buckets in seconds, the last bucket is open
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+
+# Command types tracked separately, others are counted under their keyword
+COMMAND_TYPES = ("LIST", "GET", "SET", "EN")
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of durations, cheap enough for every request."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record one duration."""
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: LatencyHistogram) -> None:
+        """Add the observations of another histogram."""
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean duration, None without observations."""
+        return self.total / self.count if self.count else None
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return the upper bound of the bucket holding a percentile."""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return (
+                    LATENCY_BUCKETS[index]
+                    if index < len(LATENCY_BUCKETS)
+                    else self.max
+                )
+        return self.max
+
+    def as_dict(self) -> dict:
+        """Return the histogram in milliseconds for diagnostics."""
+        return {
+            "count": self.count,
+            "mean_ms": _ms(self.mean),
+            "p50_ms": _ms(self.percentile(0.5)),
+            "p99_ms": _ms(self.percentile(0.99)),
+            "max_ms": _ms(self.max if self.count else None),
+            "buckets": {
+                f"le_{_ms(bound)}ms" if bound is not None else "inf": count
+                for bound, count in zip(LATENCY_BUCKETS + (None,), self.counts)
+                if count
+            },
+        }
+
+
+class CommandMetrics:
+    """Counters of one PLCComS command type."""
+
+    __slots__ = ("commands", "round_trips", "errors", "timeouts", "latency")
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.commands = 0
+        self.round_trips = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.latency = LatencyHistogram()
+
+    def merge(self, other: CommandMetrics) -> None:
+        """Add the counters of another connection."""
+        self.commands += other.commands
+        self.round_trips += other.round_trips
+        self.errors += other.errors
+        self.timeouts += other.timeouts
+        self.latency.merge(other.latency)
+
+    def as_dict(self) -> dict:
+        """Return the counters for diagnostics."""
+        return {
+            "commands": self.commands,
+            "round_trips": self.round_trips,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "latency": self.latency.as_dict(),
+        }
+
+
+class ClientMetrics:
+    """Counters of one PLCComS connection."""
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.commands = {
+            keyword: CommandMetrics() for keyword in COMMAND_TYPES
+        }
+        self.connects = 0
+        self.reconnects = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.lines_received = 0
+        self.diffs_received = 0
+
+    def command(self, keyword: str) -> CommandMetrics:
+        """Return the counters of a command type."""
+        metrics = self.commands.get(keyword)
+        if metrics is None:
+            metrics = self.commands[keyword] = CommandMetrics()
+        return metrics
+
+    def record(self, keyword: str, commands: int, seconds: float) -> None:
+        """Record a round trip carrying one or more commands."""
+        metrics = self.command(keyword)
+        metrics.commands += commands
+        metrics.round_trips += 1
+        metrics.latency.observe(seconds)
+
+    @property
+    def timeouts(self) -> int:
+        """Return the timeouts of all command types."""
+        return sum(metrics.timeouts for metrics in self.commands.values())
+
+    @classmethod
+    def merged(cls, metrics) -> ClientMetrics:
+        """Return the sum of the counters of several connections."""
+        total = cls()
+        for item in metrics:
+            for keyword, command in item.commands.items():
+                total.command(keyword).merge(command)
+            total.connects += item.connects
+            total.reconnects += item.reconnects
+            total.bytes_sent += item.bytes_sent
+            total.bytes_received += item.bytes_received
+            total.lines_received += item.lines_received
+            total.diffs_received += item.diffs_received
+        return total
+
+    def as_dict(self) -> dict:
+        """Return the counters for diagnostics."""
+        return {
+            "connects": self.connects,
+            "reconnects": self.reconnects,
+            "timeouts": self.timeouts,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "lines_received": self.lines_received,
+            "diffs_received": self.diffs_received,
+            "commands": {
+                keyword: metrics.as_dict()
+                for keyword, metrics in self.commands.items()
+            },
+        }
+
+
+class RefreshMetrics:
+    """Counters of the coordinator refreshes."""
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.refreshes = 0
+        self.failures = 0
+        self.duration = LatencyHistogram()
+        self.last_duration = None
+        self.last_variables = 0
+        self.last_bytes = 0
+        self.total_variables = 0
+
+    def record(self, seconds: float, variables: int, received: int) -> None:
+        """Record a successful refresh."""
+        self.refreshes += 1
+        self.duration.observe(seconds)
+        self.last_duration = seconds
+        self.last_variables = variables
+        self.last_bytes = received
+        self.total_variables += variables
+
+    def as_dict(self) -> dict:
+        """Return the counters for diagnostics."""
+        return {
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "last_duration_ms": _ms(self.last_duration),
+            "last_variables": self.last_variables,
+            "last_bytes_received": self.last_bytes,
+            "mean_variables": (
+                round(self.total_variables / self.refreshes, 1)
+                if self.refreshes
+                else None
+            ),
+            "duration": self.duration.as_dict(),
+        }
+
+
+def _ms(seconds: float | None) -> float | None:
+    """Convert seconds to rounded milliseconds."""
+    return None if seconds is None else round(seconds * 1000, 3)
@@ -0,0 +1,78 @@
+"""Number platform for Foxtrot PLC."""
+
+from homeassistant.components.number import NumberEntity, NumberMode
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .catalog import INTEGER_TYPES, base_type
+from .coordinator import FoxtrotPLCCoordinator
+from .entity import FoxtrotPLCEntity, async_setup_variable_entities
+
+# Value ranges of the PLC integer types
+_INTEGER_RANGES = {
+    "SINT": (-(2**7), 2**7 - 1),
+    "INT": (-(2**15), 2**15 - 1),
+    "DINT": (-(2**31), 2**31 - 1),
+    "LINT": (-(2**63), 2**63 - 1),
+    "USINT": (0, 2**8 - 1),
+    "UINT": (0, 2**16 - 1),
+    "UDINT": (0, 2**32 - 1),
+    "ULINT": (0, 2**64 - 1),
+    "BYTE": (0, 2**8 - 1),
+    "WORD": (0, 2**16 - 1),
+    "DWORD": (0, 2**32 - 1),
+    "LWORD": (0, 2**64 - 1),
+}
+_REAL_RANGE = (-1e9, 1e9)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up numbers for writable numeric variables."""
+    async_setup_variable_entities(
+        hass, config_entry, Platform.NUMBER, FoxtrotPLCNumber
+    )
+
+
+class FoxtrotPLCNumber(FoxtrotPLCEntity, NumberEntity):
+    """Representation of a writable numeric Foxtrot PLC variable."""
+
+    _attr_mode = NumberMode.BOX
+
+    def __init__(
+        self, coordinator: FoxtrotPLCCoordinator, variable: str
+    ) -> None:
+        """Initialize the number."""
+        super().__init__(coordinator, variable)
+        plc_type = base_type(coordinator.catalog.types.get(variable, ""))
+        self._integer = plc_type in INTEGER_TYPES
+        if self._integer:
+            low, high = _INTEGER_RANGES[plc_type]
+            self._attr_native_step = 1
+        else:
+            low, high = _REAL_RANGE
+            self._attr_native_step = 0.01
+        self._attr_native_min_value = low
+        self._attr_native_max_value = high
+        self._attr_native_unit_of_measurement = coordinator.get_metadata(
+            variable
+        ).unit
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the current value."""
+        value = self._value
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return value
+        return None
+
+    async def async_set_native_value(self, value: float) -> None:
+        """Write a new value."""
+        await self.coordinator.async_set_variables(
+            {self._variable: int(value) if self._integer else value}
+        )
@@ -0,0 +1,62 @@
+"""Chunked parser for the PLCComS response stream."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+# Bytes read from the socket at once
+CHUNK_SIZE = 65536
+
+
+class ResponseParser:
+    """Split PLCComS response bytes into (keyword, name, value) records.
+
+    Chunks are appended to one reusable buffer. The last line boundary is
+    found on the bytes, every complete line is decoded in one go straight
+    from a memoryview of the buffer and only the incomplete tail stays
+    buffered. Lines are then split with str methods, which run in C; a
+    per-line walk over the bytes in Python measured slower than this.
+
+    A line without a comma has value None, e.g. ("LIST", "", None) for
+    the end of a LIST: response, and a line without a keyword has
+    keyword "".
+    """
+
+    def __init__(self) -> None:
+        """Initialize the parser with an empty buffer."""
+        self._buffer = bytearray()
+
+    def __len__(self) -> int:
+        """Return the number of buffered bytes of an incomplete line."""
+        return len(self._buffer)
+
+    def feed(self, data: bytes) -> Iterator[tuple[str, str, str | None]]:
+        """Add received bytes and yield the records of the complete lines."""
+        buffer = self._buffer
+        buffer += data
+        end = buffer.rfind(b"\n") + 1
+        if not end:
+            return
+        with memoryview(buffer) as view:
+            text = str(view[:end], "utf-8", "replace")
+        del buffer[:end]
+
+        for line in text.split("\n"):
+            line = line.strip()
+            if not line:
+                continue
+            keyword, colon, rest = line.partition(":")
+            if not colon:
+                yield "", line, None
+                continue
+            name, comma, value = rest.partition(",")
+            yield keyword, name, value if comma else None
+
+
+def format_record(keyword: str, name: str, value: str | None) -> str:
+    """Return a record as the response line it was parsed from."""
+    if not keyword:
+        return name
+    if value is None:
+        return f"{keyword}:{name}"
+    return f"{keyword}:{name},{value}"
@@ -1,109 +1,824 @@
 import asyncio
 import logging
+import time
+import zlib
+from collections import deque
+
 from async_timeout import timeout
 
+from .backoff import Backoff, VariableQuarantine
+from .const import DEFAULT_BATCH_SIZE, STALLED_RESPONSE_TIMEOUT
+from .metrics import ClientMetrics
+from .parser import CHUNK_SIZE, ResponseParser, format_record
+from .trace import RECEIVED, SENT, ProtocolTrace, TraceRecorder
+
 _LOGGER = logging.getLogger(__name__)
 
+# Acknowledgements of subscription commands, which nobody waits for
+_UNSOLICITED_KEYWORDS = frozenset(("EN", "DI"))
+# Commands PLCComS only answers to reject them, with ERROR:<command> <name>
+_UNANSWERED_COMMANDS = frozenset(("SET", "EN", "DI"))
+
+
+class PLCComsError(Exception):
+    """Error reported by PLCComS for a single command."""
+
+
+class _PendingResponse:
+    """A command waiting for its response from the reader task.
+
+    A single-line response resolves to its (keyword, name, value) record.
+    A multi-line response, like LIST:, collects (name, value) pairs until
+    the bare keyword line that ends it.
+    """
+
+    __slots__ = ("future", "expect", "name", "multiline", "lines", "created")
+
+    def __init__(
+        self,
+        future,
+        expect: str,
+        multiline: bool = False,
+        name: str | None = None,
+    ) -> None:
+        """Initialize the pending response."""
+        self.future = future
+        self.expect = expect
+        self.name = name
+        self.multiline = multiline
+        self.lines = []
+        self.created = time.monotonic()
+
+    def feed(self, keyword: str, name: str, value: str | None) -> bool:
+        """Consume a response record, return True once it is complete."""
+        if keyword == "ERROR":
+            if not self.future.done():
+                self.future.set_exception(
+                    PLCComsError(format_record(keyword, name, value))
+                )
+            return True
+        if not self.multiline:
+            if not self.future.done():
+                self.future.set_result((keyword, name, value))
+            return True
+        if keyword == self.expect and not name and value is None:
+            if not self.future.done():
+                self.future.set_result(self.lines)
+            return True
+        self.lines.append((name, value))
+        return False
+
+    def fail(self, err: Exception) -> None:
+        """Fail the response because the connection is gone."""
+        if not self.future.done():
+            self.future.set_exception(err)
+
+
 class PLCComsClient:
-    """Client to handle PLCComS protocol with improved async handling."""
+    """Client to handle PLCComS protocol with improved async handling.
 
-    def __init__(self, host: str, port: int) -> None:
+    A single reader task owns the socket. Responses are handed to the
+    pending commands in the order they were written, so any number of
+    callers can have commands in flight, and DIFF: notifications are
+    passed to diff_callback as they arrive.
+
+    A command that times out keeps its place in that order, so a late
+    response is still matched to it and the connection stays usable.
+    Only a connection stuck on an abandoned response, or one that fails,
+    is closed, and reconnects then back off.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        quarantine: VariableQuarantine | None = None,
+    ) -> None:
         """Initialize the client."""
         self.host = host
         self.port = port
+        self.batch_size = max(1, batch_size)
         self.reader = None
         self.writer = None
-        self._lock = asyncio.Lock()
+        self.diff_callback = None
+        self.rejected_callback = None
+        self._connect_lock = asyncio.Lock()
+        self._reader_task = None
+        self._pending = deque()
+        self._subscriptions = {}
+        self.metrics = ClientMetrics()
+        self.quarantine = (
+            quarantine if quarantine is not None else VariableQuarantine()
+        )
+        self.backoff = Backoff()
+        self.trace = ProtocolTrace()
+        self.recorder = None  # Channel of a TraceRecorder while recording
         self.connection_timeout = 10  # seconds
         self.command_timeout = 5  # seconds
+        self.list_timeout = 60  # seconds, for the whole LIST: stream
+
+    @property
+    def connected(self) -> bool:
+        """Return True if the connection is open."""
+        return self.writer is not None
 
     async def connect(self) -> None:
         """Connect to the PLC."""
         if self.reader and self.writer:
             return  # Already connected
 
-        try:
-            async with timeout(self.connection_timeout):
-                self.reader, self.writer = await asyncio.open_connection(
-                    self.host, self.port
+        async with self._connect_lock:
+            if self.reader and self.writer:
+                return  # Connected while we waited
+            delay = self.backoff.remaining()
+            if delay:
+                raise ConnectionError(
+                    f"Reconnecting to PLC at {self.host}:{self.port} "
+                    f"in {delay:.1f}s"
                 )
-            _LOGGER.info(f"Connected to PLC at {self.host}:{self.port}")
-        except asyncio.TimeoutError:
-            _LOGGER.error(f"Connection timeout to PLC at {self.host}:{self.port}")
-            raise
-        except Exception as e:
-            _LOGGER.error(f"Failed to connect to PLC: {e}")
-            raise
+            try:
+                async with timeout(self.connection_timeout):
+                    reader, writer = await asyncio.open_connection(
+                        self.host, self.port
+                    )
+                _LOGGER.info(f"Connected to PLC at {self.host}:{self.port}")
+            except asyncio.TimeoutError:
+                delay = self.backoff.failure()
+                _LOGGER.error(
+                    f"Connection timeout to PLC at {self.host}:{self.port}, "
+                    f"retrying in {delay:.1f}s"
+                )
+                raise
+            except Exception as e:
+                delay = self.backoff.failure()
+                _LOGGER.error(
+                    f"Failed to connect to PLC: {e}, retrying in {delay:.1f}s"
+                )
+                raise
+
+            self.reader, self.writer = reader, writer
+            if self.metrics.connects:
+                self.metrics.reconnects += 1
+            self.metrics.connects += 1
+            self._reader_task = asyncio.get_running_loop().create_task(
+                self._read_loop(reader, writer)
+            )
+            if self._subscriptions:
+                # EN: registrations do not survive a reconnect
+                self._write(self._subscribe_lines(self._subscriptions))
 
     async def disconnect(self) -> None:
         """Disconnect from the PLC."""
-        if self.writer:
-            self.writer.close()
+        task, self._reader_task = self._reader_task, None
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        writer = self.writer
+        self._connection_lost(writer, ConnectionError("Disconnected from PLC"))
+        if writer:
             try:
-                await self.writer.wait_closed()
+                await writer.wait_closed()
             except Exception as e:
                 _LOGGER.error(f"Error while closing connection: {e}")
+            _LOGGER.info("Disconnected from PLC")
+
+    async def wait_closed(self) -> None:
+        """Wait until the current connection is closed."""
+        if self._reader_task is not None:
+            await asyncio.shield(self._reader_task)
+
+    async def _read_loop(self, reader, writer) -> None:
+        """Read every line from the PLC and route it to its consumer."""
+        parser = ResponseParser()
+        dispatch = self._dispatch
+        try:
+            while True:
+                chunk = await reader.read(CHUNK_SIZE)
+                if not chunk:
+                    raise ConnectionError("Connection closed by PLC")
+                self.metrics.bytes_received += len(chunk)
+                self.trace.record(RECEIVED, chunk)
+                if self.recorder is not None:
+                    self.recorder.record(RECEIVED, chunk)
+                for keyword, name, value in parser.feed(chunk):
+                    dispatch(keyword, name, value)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            _LOGGER.error(f"Connection to PLC lost: {e}")
+            if writer is self.writer:
+                self.backoff.failure()
+            self._connection_lost(writer, e)
+
+    def _dispatch(self, keyword: str, name: str, value: str | None) -> None:
+        """Route a response record to its pending command or a callback."""
+        self.metrics.lines_received += 1
+        if keyword == "DIFF":
+            self.metrics.diffs_received += 1
+            if value is not None and self.diff_callback is not None:
+                self.diff_callback(name, value)
+            return
+        if keyword == "ERROR" and self._rejected(name, value):
+            return
+
+        # An error names the command it answers: ERROR:GET <name>
+        if keyword == "ERROR":
+            expect, _, answered = name.partition(" ")
+        else:
+            expect, answered = keyword, name
+        pending = self._pending_head(expect)
+        if pending is not None and pending.name is not None:
+            # Named commands (GET:) take the response naming their variable
+            if expect == pending.expect and answered != pending.name:
+                pending = self._pending_for(expect, answered)
+        if pending is None or (
+            keyword in _UNSOLICITED_KEYWORDS and keyword != pending.expect
+        ):
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(
+                    "Ignoring unsolicited line: %s",
+                    format_record(keyword, name, value),
+                )
+            return
+        if pending.feed(keyword, name, value):
+            self._pending.popleft()
+
+    def _pending_head(self, expect: str) -> _PendingResponse | None:
+        """Return the oldest pending command, dropping abandoned ones.
+
+        A command given up by its caller that the PLC never answered would
+        otherwise take the response of the next command. Abandoned commands
+        of another keyword than the response cannot be what it answers.
+        Subscription acknowledgements can come from writes made before the
+        command, so they drop nothing.
+        """
+        queue = self._pending
+        if expect in _UNSOLICITED_KEYWORDS:
+            return queue[0] if queue else None
+        while queue and queue[0].future.done() and queue[0].expect != expect:
+            queue.popleft()
+        return queue[0] if queue else None
+
+    def _pending_for(self, expect: str, name: str) -> _PendingResponse | None:
+        """Return the queued command a response names, None if there is none.
+
+        PLCComS answers in order, so the commands queued before it were
+        skipped by the PLC and fail. A response naming no queued command
+        leaves the queue alone.
+        """
+        queue = self._pending
+        for index, pending in enumerate(queue):
+            if pending.expect == expect and pending.name == name:
+                break
+        else:
+            return None
+        for _ in range(index):
+            skipped = queue.popleft()
+            skipped.fail(
+                PLCComsError(f"No response to {skipped.expect}:{skipped.name}")
+            )
+        return pending
+
+    def _rejected(self, name: str, value: str | None) -> bool:
+        """Consume the ERROR: of a command that has no pending response.
+
+        SET:, EN: and DI: are only answered when they fail, so their errors
+        must not reach the pending GET: or LIST: at the head of the queue.
+        Returns False for errors of other commands.
+        """
+        command, _, subject = name.partition(" ")
+        if command not in _UNANSWERED_COMMANDS:
+            return False
+        self.metrics.command(command).errors += 1
+        if command == "EN":
+            # Not registered again on reconnect
+            self._subscriptions.pop(subject, None)
+        _LOGGER.warning("PLC rejected %s", format_record("ERROR", name, value))
+        if self.rejected_callback is not None:
+            self.rejected_callback(command, subject)
+        return True
+
+    def _connection_lost(self, writer, err: Exception) -> None:
+        """Forget a closed connection and fail everything waiting on it."""
+        if writer is None or writer is not self.writer:
+            return  # Already replaced by a newer connection
+        writer.close()
         self.reader = None
         self.writer = None
-        _LOGGER.info("Disconnected from PLC")
+        if self._reader_task is not None and self._reader_task.done():
+            self._reader_task = None
+        pending, self._pending = self._pending, deque()
+        for response in pending:
+            response.fail(err)
+
+    def _write(self, lines) -> None:
+        """Queue command lines on the socket."""
+        data = "".join(lines).encode()
+        self.metrics.bytes_sent += len(data)
+        self.trace.record(SENT, data)
+        if self.recorder is not None:
+            self.recorder.record(SENT, data)
+        self.writer.write(data)
+
+    async def _fault(self) -> None:
+        """Close a failed connection and back off before reconnecting."""
+        await self.disconnect()
+        delay = self.backoff.failure()
+        _LOGGER.warning(
+            f"Reconnecting to PLC at {self.host}:{self.port} in {delay:.1f}s"
+        )
+
+    async def _check_stalled(self) -> None:
+        """Close the connection if an abandoned response never arrived.
+
+        Commands that timed out keep their place in the response order. If
+        the oldest one is still unanswered long after it was given up, the
+        PLC will not answer it and every later response would wait behind.
+        """
+        pending = self._pending
+        if (
+            pending
+            and pending[0].future.done()
+            and time.monotonic() - pending[0].created
+            > STALLED_RESPONSE_TIMEOUT
+        ):
+            _LOGGER.warning(
+                f"No response to {pending[0].expect}: for "
+                f"{STALLED_RESPONSE_TIMEOUT}s, closing the connection"
+            )
+            await self._fault()
+
+    def _expect(
+        self, expect: str, multiline: bool = False, name: str | None = None
+    ):
+        """Register a pending response for a keyword and return its future.
+
+        With a name, the command only takes a response naming the same
+        variable. A response naming a later command shows that the PLC
+        skipped this one, which then fails.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(_PendingResponse(future, expect, multiline, name))
+        return future
 
     async def send_command(self, command: str):
         """Send a command to the PLC and return the response."""
-        async with self._lock:
-            if not self.writer:
-                await self.connect()
+        await self._check_stalled()
+        await self.connect()
 
-            try:
-                async with timeout(self.command_timeout):
-                    self.writer.write(f"{command}\n".encode())
-                    await self.writer.drain()
-                    response = await self.reader.readuntil(b"\n")
-                    return response.decode().strip()
-            except asyncio.TimeoutError:
-                _LOGGER.error(f"Command timeout: {command}")
-                await self.disconnect()  # Disconnect on timeout
-                raise
-            except Exception as e:
-                _LOGGER.error(f"Error sending command '{command}': {e}")
-                await self.disconnect()  # Disconnect on error
-                raise
+        keyword = command.split(":", 1)[0]
+        start = time.perf_counter()
+        try:
+            async with timeout(self.command_timeout):
+                # Queue and write without yielding, so responses stay in order
+                future = self._expect(keyword)
+                self._write([f"{command}\n"])
+                await self.writer.drain()
+                response = format_record(*await future)
+        except asyncio.TimeoutError:
+            # The response keeps its place in the order, the connection stays
+            self.metrics.command(keyword).timeouts += 1
+            _LOGGER.error(f"Command timeout: {command}")
+            raise
+        except PLCComsError:
+            self.metrics.command(keyword).errors += 1
+            raise
+        except Exception as e:
+            _LOGGER.error(f"Error sending command '{command}': {e}")
+            await self._fault()
+            raise
+        self.metrics.record(keyword, 1, time.perf_counter() - start)
+        self.backoff.success()
+        return response
 
-    async def list_variables(self):
-        """List all variables from the PLC."""
-        variables = []
+    async def _request_lines(self, keyword: str, request_timeout: float):
+        """Send a command with a multi-line response, return its pairs.
+
+        The response is a (name, value) pair per line, ended by the bare
+        keyword line, like LIST: and GETINFO: answer.
+        """
+        await self._check_stalled()
+        await self.connect()
+
+        start = time.perf_counter()
         try:
-            await self.send_command("LIST:")
-            while True:
-                line = await self.reader.readline()
-                if line.strip() == b"LIST:":
-                    break
-                variable = line.decode().strip()
-                if variable.startswith("LIST:"):
-                    variable = variable[5:]  # Remove "LIST:" prefix
-                if variable:  # Only add non-empty lines
-                    variable_name = variable.split(",")[0]  # Remove type information
-                    variables.append(variable_name)
+            async with timeout(request_timeout):
+                future = self._expect(keyword, multiline=True)
+                self._write([f"{keyword}:\n"])
+                await self.writer.drain()
+                lines = await future
+        except asyncio.TimeoutError:
+            self.metrics.command(keyword).timeouts += 1
+            _LOGGER.error(f"Timeout waiting for the {keyword}: response")
+            raise
+        except PLCComsError:
+            self.metrics.command(keyword).errors += 1
+            raise
         except Exception as e:
-            _LOGGER.error(f"Error listing variables: {e}")
+            _LOGGER.error(f"Error sending '{keyword}:': {e}")
+            await self._fault()
             raise
+        self.metrics.record(keyword, 1, time.perf_counter() - start)
+        self.backoff.success()
+        return lines
+
+    async def list_variables(self):
+        """List all variables from the PLC as a name to PLC type mapping."""
+        variables = {}
+        for name, plc_type in await self._request_lines(
+            "LIST", self.list_timeout
+        ):
+            if name:  # Only add non-empty lines
+                variables[name] = plc_type or ""
         return variables
 
-    async def get_variables(self, variables):
-        """Get the values of specified variables."""
+    async def get_info(self) -> list[tuple[str, str]]:
+        """Return the GETINFO: response as (key, value) pairs.
+
+        Keys can repeat, NETWORK is listed once per connected client.
+        """
+        return [
+            (key, value or "")
+            for key, value in await self._request_lines(
+                "GETINFO", self.command_timeout
+            )
+            if key
+        ]
+
+    async def get_variables(self, variables, batch_size: int | None = None):
+        """Get the values of specified variables.
+
+        GET: commands are pipelined: each window of batch_size commands is
+        written at once and the responses, which PLCComS returns in order,
+        are matched back to the requested names. Quarantined variables are
+        skipped. If a window times out, the first unanswered variable is
+        blamed and quarantined and the values received so far are returned;
+        only a window without any answer counts as a connection fault.
+        """
+        variables = self.quarantine.due(variables)
+        batch_size = max(1, batch_size or self.batch_size)
         results = {}
+        metrics = self.metrics.command("GET")
+        await self._check_stalled()
+        await self.connect()
+
+        try:
+            for start in range(0, len(variables), batch_size):
+                batch = variables[start : start + batch_size]
+                sent = time.perf_counter()
+                futures = [
+                    self._expect("GET", name=variable) for variable in batch
+                ]
+                try:
+                    async with timeout(self.command_timeout):
+                        self._write(f"GET:{variable}\n" for variable in batch)
+                        await self.writer.drain()
+                        responses = await asyncio.gather(
+                            *futures, return_exceptions=True
+                        )
+                except asyncio.TimeoutError:
+                    metrics.timeouts += 1
+                    if self._collect_partial(batch, futures, results):
+                        return results
+                    _LOGGER.error(
+                        f"Timeout getting variables, {len(results)} of "
+                        f"{len(variables)} received"
+                    )
+                    await self._fault()
+                    raise asyncio.TimeoutError(
+                        f"No response from PLC within {self.command_timeout}s"
+                    ) from None
+                self.metrics.record(
+                    "GET", len(batch), time.perf_counter() - sent
+                )
+                self.backoff.success()
+                self._collect(batch, responses, results)
+        except asyncio.TimeoutError:
+            raise
+        except Exception as e:
+            _LOGGER.error(f"Error getting variables: {e}")
+            await self._fault()
+            raise
+        return results
+
+    def _collect(self, batch, responses, results: dict) -> None:
+        """Store the values of GET: responses and track failing variables."""
+        quarantine = self.quarantine
+        check = bool(len(quarantine))
+        for variable, response in zip(batch, responses):
+            if isinstance(response, PLCComsError):
+                self.metrics.command("GET").errors += 1
+                self._read_failed(variable, str(response))
+                continue
+            if isinstance(response, BaseException):
+                raise response
+            value = self._parse_get_response(variable, response)
+            if value is None:
+                self._read_failed(variable, "malformed response")
+                continue
+            results[variable] = value
+            if check and variable in quarantine:
+                quarantine.succeeded(variable)
+
+    def _collect_partial(self, batch, futures, results: dict) -> bool:
+        """Keep the answers of a timed-out window and blame its stuck variable.
+
+        Returns False if nothing was answered at all. The connection is then
+        suspect rather than the variable, which is only quarantined if it
+        heads the unanswered window several times in a row.
+        """
+        for future in futures:
+            # Abandoned responses stay queued, so late answers still line up
+            future.cancel()
+        answered = next(
+            (
+                index
+                for index, future in enumerate(futures)
+                if future.cancelled()
+            ),
+            len(futures),
+        )
+        self._collect(
+            batch[:answered],
+            [
+                future.exception() or future.result()
+                for future in futures[:answered]
+            ],
+            results,
+        )
+        responsive = bool(answered or results)
+        if answered < len(batch):
+            self._read_failed(batch[answered], "timeout", immediate=responsive)
+        return responsive
+
+    def _read_failed(
+        self, variable: str, error: str, immediate: bool = False
+    ) -> None:
+        """Count a failed read, quarantining a variable that keeps failing."""
+        delay = self.quarantine.failed(variable, error, immediate)
+        if delay is None:
+            _LOGGER.debug("Error getting variable %s: %s", variable, error)
+        else:
+            _LOGGER.warning(
+                f"Error getting variable {variable}: {error}, "
+                f"not polled again for {delay:.0f}s"
+            )
+
+    @staticmethod
+    def _parse_get_response(variable: str, response):
+        """Return the value of a GET: response, None if it is malformed."""
+        keyword, name, value = response
+        if keyword == "GET" and name == variable and value is not None:
+            return value
+        _LOGGER.warning(
+            f"Unexpected response format for variable {variable}: "
+            f"{format_record(*response)}"
+        )
+        return None
+
+    async def set_variable(self, variable: str, value: str) -> None:
+        """Set a variable in the PLC.
+
+        PLCComS does not acknowledge SET:. A rejected SET: is answered with
+        an ERROR: that the reader logs, counts and passes on to
+        rejected_callback; nobody waits for it.
+        """
+        await self.set_variables({variable: value})
+
+    async def set_variables(self, values) -> None:
+        """Set several variables with one pipelined write."""
+        await self.connect()
+        start = time.perf_counter()
+        self._write(
+            f"SET:{variable},{value}\n" for variable, value in values.items()
+        )
+        await self.writer.drain()
+        self.metrics.record("SET", len(values), time.perf_counter() - start)
+
+    @staticmethod
+    def _subscribe_lines(deltas):
+        """Return the EN: lines for a name to delta mapping."""
+        return [
+            f"EN:{variable}\n" if delta is None else f"EN:{variable} {delta}\n"
+            for variable, delta in deltas.items()
+        ]
+
+    async def subscribe(self, variables, deltas=None) -> None:
+        """Enable change notifications for variables with EN:.
+
+        Subscriptions are remembered and registered again on reconnect.
+        """
+        deltas = deltas or {}
+        added = {variable: deltas.get(variable) for variable in variables}
+        try:
+            await self.connect()
+        finally:
+            # Added after connect(), which registers the known ones again
+            self._subscriptions.update(added)
+        start = time.perf_counter()
+        self._write(self._subscribe_lines(added))
+        await self.writer.drain()
+        self.metrics.record("EN", len(added), time.perf_counter() - start)
+        _LOGGER.info(f"Subscribed to {len(added)} variables")
+
+    async def unsubscribe(self, variables) -> None:
+        """Disable change notifications for variables with DI:."""
+        variables = [
+            variable
+            for variable in variables
+            if variable in self._subscriptions
+        ]
         for variable in variables:
-            try:
-                response = await self.send_command(f"GET:{variable}")
-                parts = response.split(",", 1)
-                if len(parts) == 2:
-                    value = parts[1]
-                    results[variable] = value
-                else:
-                    _LOGGER.warning(f"Unexpected response format for variable {variable}: {response}")
-            except Exception as e:
-                _LOGGER.error(f"Error getting variable {variable}: {e}")
+            del self._subscriptions[variable]
+        if not self.writer or not variables:
+            return
+        self._write(f"DI:{variable}\n" for variable in variables)
+        await self.writer.drain()
+
+
+class PLCComsPool:
+    """Spread variables over several PLCComS connections.
+
+    PLCComS serves every TCP client independently, so large polls are split
+    across the connections by a stable hash of the variable name and run
+    concurrently. Each connection reconnects on its own, so one dropped
+    socket only costs the variables of its shard. Catalog, diagnostic and
+    write commands use the first connection.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        size: int = 1,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        """Initialize the pool."""
+        self.quarantine = VariableQuarantine()
+        self.clients = [
+            PLCComsClient(host, port, batch_size, self.quarantine)
+            for _ in range(max(1, size))
+        ]
+
+    @property
+    def primary(self) -> PLCComsClient:
+        """Return the connection used for non-sharded commands."""
+        return self.clients[0]
+
+    @property
+    def connected(self) -> bool:
+        """Return True if every connection is open."""
+        return all(client.connected for client in self.clients)
+
+    @property
+    def metrics(self) -> ClientMetrics:
+        """Return the counters of all connections added up."""
+        return ClientMetrics.merged(client.metrics for client in self.clients)
+
+    @property
+    def traces(self) -> list[ProtocolTrace]:
+        """Return the protocol trace of every connection."""
+        return [client.trace for client in self.clients]
+
+    def start_recording(self, recorder: TraceRecorder) -> None:
+        """Record the traffic of every connection into a recorder."""
+        for index, client in enumerate(self.clients):
+            client.recorder = recorder.channel(index)
+
+    def stop_recording(self) -> None:
+        """Stop recording the traffic."""
+        for client in self.clients:
+            client.recorder = None
+
+    @property
+    def diff_callback(self):
+        """Return the callback receiving DIFF: notifications."""
+        return self.primary.diff_callback
+
+    @diff_callback.setter
+    def diff_callback(self, callback) -> None:
+        """Set the callback receiving DIFF: notifications on every shard."""
+        for client in self.clients:
+            client.diff_callback = callback
+
+    @property
+    def rejected_callback(self):
+        """Return the callback told about rejected SET:, EN: and DI:."""
+        return self.primary.rejected_callback
+
+    @rejected_callback.setter
+    def rejected_callback(self, callback) -> None:
+        """Set the callback told about rejected commands on every shard."""
+        for client in self.clients:
+            client.rejected_callback = callback
+
+    def shard_for(self, variable: str) -> int:
+        """Return the index of the connection that owns a variable."""
+        return zlib.crc32(variable.encode()) % len(self.clients)
+
+    def _split(self, variables) -> list[list[str]]:
+        """Split variables into one list per connection."""
+        shards = [[] for _ in self.clients]
+        if len(shards) == 1:
+            shards[0].extend(variables)
+            return shards
+        for variable in variables:
+            shards[self.shard_for(variable)].append(variable)
+        return shards
+
+    async def connect(self) -> None:
+        """Open every connection that is not open yet."""
+        await asyncio.gather(*(client.connect() for client in self.clients))
+
+    async def disconnect(self) -> None:
+        """Close all connections."""
+        await asyncio.gather(*(client.disconnect() for client in self.clients))
+
+    async def wait_closed(self) -> None:
+        """Wait until any of the connections closes."""
+        tasks = [
+            asyncio.ensure_future(client.wait_closed())
+            for client in self.clients
+        ]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def send_command(self, command: str):
+        """Send a command on the first connection."""
+        return await self.primary.send_command(command)
+
+    async def list_variables(self):
+        """List all variables from the PLC."""
+        return await self.primary.list_variables()
+
+    async def get_info(self) -> list[tuple[str, str]]:
+        """Return the GETINFO: response of the PLC."""
+        return await self.primary.get_info()
+
+    async def get_variables(self, variables, batch_size: int | None = None):
+        """Get the values of variables, polling the shards concurrently.
+
+        A failing shard is logged and skipped; the call only fails if every
+        shard does.
+        """
+        polled = [
+            (index, shard)
+            for index, shard in enumerate(self._split(variables))
+            if shard
+        ]
+        responses = await asyncio.gather(
+            *(
+                self.clients[index].get_variables(shard, batch_size)
+                for index, shard in polled
+            ),
+            return_exceptions=True,
+        )
+        results = {}
+        errors = []
+        for (index, shard), response in zip(polled, responses):
+            if isinstance(response, BaseException):
+                _LOGGER.warning(
+                    f"Connection {index} failed to get {len(shard)} "
+                    f"variables: {response}"
+                )
+                errors.append(response)
+            else:
+                results.update(response)
+        if errors and len(errors) == len(polled):
+            raise errors[0]
         return results
 
     async def set_variable(self, variable: str, value: str) -> None:
         """Set a variable in the PLC."""
-        await self.send_command(f"SET:{variable},{value}")
+        await self.primary.set_variable(variable, value)
+
+    async def set_variables(self, values) -> None:
+        """Set several variables with one pipelined write."""
+        await self.primary.set_variables(values)
+
+    async def subscribe(self, variables, deltas=None) -> None:
+        """Enable change notifications, each shard on its own connection."""
+        await asyncio.gather(
+            *(
+                client.subscribe(shard, deltas)
+                for client, shard in zip(self.clients, self._split(variables))
+                if shard
+            )
+        )
+
+    async def unsubscribe(self, variables) -> None:
+        """Disable change notifications."""
+        await asyncio.gather(
+            *(
+                client.unsubscribe(shard)
+                for client, shard in zip(self.clients, self._split(variables))
+                if shard
+            )
+        )
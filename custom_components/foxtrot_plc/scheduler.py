@@ -0,0 +1,161 @@
+"""Refresh scheduling shared by all Foxtrot PLC config entries."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from contextlib import asynccontextmanager
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import MAX_CONCURRENT_REFRESHES
+
+_LOGGER = logging.getLogger(__name__)
+
+# Shortest gap between two refreshes of one PLC, as a share of its interval
+MIN_REFRESH_GAP = 0.5
+
+
+class _PLCLoad:
+    """Scheduling state and load counters of one PLC."""
+
+    __slots__ = ("phase", "refreshes", "busy", "waited", "max_wait")
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.phase = 0.0
+        self.refreshes = 0
+        self.busy = 0.0
+        self.waited = 0.0
+        self.max_wait = 0.0
+
+
+class FoxtrotPLCScheduler:
+    """Spread the refreshes of many PLCs and limit how many run at once.
+
+    Every coordinator gets a phase, an evenly spaced share of its update
+    interval, and its refreshes are scheduled on that phase instead of all
+    entries firing on the same second. A semaphore caps the number of PLCs
+    polled concurrently across the whole Home Assistant instance.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        max_concurrent: int = MAX_CONCURRENT_REFRESHES,
+    ) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self.max_concurrent = max_concurrent
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._coordinators = {}
+        self._active = 0
+
+    def __len__(self) -> int:
+        """Return the number of scheduled PLCs."""
+        return len(self._coordinators)
+
+    @callback
+    def async_add(self, coordinator) -> None:
+        """Start scheduling a coordinator and re-space the phases."""
+        self._coordinators[coordinator] = _PLCLoad()
+        self._assign_phases()
+
+    @callback
+    def async_remove(self, coordinator) -> None:
+        """Stop scheduling a coordinator and re-space the phases."""
+        self._coordinators.pop(coordinator, None)
+        self._assign_phases()
+
+    def _assign_phases(self) -> None:
+        """Spread the phases evenly over [0, 1)."""
+        count = len(self._coordinators)
+        for index, load in enumerate(self._coordinators.values()):
+            load.phase = index / count
+
+    def next_refresh(self, coordinator, interval: float) -> float:
+        """Return the loop time of the next refresh of a coordinator.
+
+        Refreshes land on the coordinator's phase of its interval, at
+        least half an interval after now.
+        """
+        load = self._coordinators.get(coordinator)
+        now = self.hass.loop.time()
+        if load is None or interval <= 0:
+            return now + interval
+        offset = load.phase * interval
+        earliest = now + interval * MIN_REFRESH_GAP
+        return offset + math.ceil((earliest - offset) / interval) * interval
+
+    @asynccontextmanager
+    async def refresh_slot(self, coordinator):
+        """Hold one of the global refresh slots while a PLC is polled."""
+        load = self._coordinators.get(coordinator)
+        queued = time.perf_counter()
+        async with self._semaphore:
+            started = time.perf_counter()
+            self._active += 1
+            try:
+                yield
+            finally:
+                self._active -= 1
+                if load is not None:
+                    waited = started - queued
+                    load.refreshes += 1
+                    load.busy += time.perf_counter() - started
+                    load.waited += waited
+                    load.max_wait = max(load.max_wait, waited)
+        if started - queued > 1:
+            _LOGGER.debug(
+                "Refresh of %s waited %.1fs for a slot",
+                coordinator.name,
+                started - queued,
+            )
+
+    def load(self, coordinator) -> dict | None:
+        """Return the load report of one PLC."""
+        load = self._coordinators.get(coordinator)
+        if load is None:
+            return None
+        interval = (
+            coordinator.update_interval.total_seconds()
+            if coordinator.update_interval
+            else None
+        )
+        mean_busy = load.busy / load.refreshes if load.refreshes else None
+        return {
+            "phase": round(load.phase, 3),
+            "interval": interval,
+            "refreshes": load.refreshes,
+            "mean_refresh_s": (
+                None if mean_busy is None else round(mean_busy, 3)
+            ),
+            "duty_cycle": (
+                round(mean_busy / interval, 4)
+                if mean_busy is not None and interval
+                else None
+            ),
+            "mean_wait_s": (
+                round(load.waited / load.refreshes, 3)
+                if load.refreshes
+                else None
+            ),
+            "max_wait_s": round(load.max_wait, 3),
+        }
+
+    def report(self) -> dict:
+        """Return the load of every PLC and the shared limits."""
+        return {
+            "max_concurrent": self.max_concurrent,
+            "active": self._active,
+            "plcs": {
+                (
+                    coordinator.config_entry.entry_id
+                    if coordinator.config_entry
+                    else coordinator.name
+                ): self.load(coordinator)
+                for coordinator in self._coordinators
+            },
+        }
@@ -0,0 +1,46 @@
+"""Select platform for Foxtrot PLC."""
+
+from homeassistant.components.select import SelectEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .coordinator import FoxtrotPLCCoordinator
+from .entity import FoxtrotPLCEntity, async_setup_variable_entities
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up selects for integer variables with option labels."""
+    async_setup_variable_entities(
+        hass, config_entry, Platform.SELECT, FoxtrotPLCSelect
+    )
+
+
+class FoxtrotPLCSelect(FoxtrotPLCEntity, SelectEntity):
+    """Integer PLC variable whose values are the indices of option labels."""
+
+    def __init__(
+        self, coordinator: FoxtrotPLCCoordinator, variable: str
+    ) -> None:
+        """Initialize the select."""
+        super().__init__(coordinator, variable)
+        self._attr_options = coordinator.get_select_options(variable)
+
+    @property
+    def current_option(self) -> str | None:
+        """Return the label of the current value."""
+        value = self._value
+        if isinstance(value, int) and 0 <= value < len(self._attr_options):
+            return self._attr_options[value]
+        return None
+
+    async def async_select_option(self, option: str) -> None:
+        """Write the value of the selected label."""
+        await self.coordinator.async_set_variables(
+            {self._variable: self._attr_options.index(option)}
+        )
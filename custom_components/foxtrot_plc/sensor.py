@@ -1,19 +1,23 @@
 """Sensor platform for Foxtrot PLC."""
-import logging
 
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
 from typing import Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
+    SensorEntityDescription,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     PERCENTAGE,
-    UnitOfEnergy,
-    UnitOfPower,
-    UnitOfTemperature,
+    EntityCategory,
+    Platform,
+    UnitOfInformation,
+    UnitOfTime,
 )
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -21,9 +25,115 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import FoxtrotPLCCoordinator
+from .entity import FoxtrotPLCEntity, async_setup_variable_entities
 
 _LOGGER = logging.getLogger(__name__)
 
+
+@dataclass(frozen=True, kw_only=True)
+class FoxtrotPLCMetricDescription(SensorEntityDescription):
+    """Description of a connection metric sensor."""
+
+    value_fn: Callable[[FoxtrotPLCCoordinator], Any]
+
+
+def _get_latency(coordinator: FoxtrotPLCCoordinator) -> float | None:
+    """Return the mean GET: round trip in milliseconds."""
+    mean = coordinator.client.metrics.command("GET").latency.mean
+    return None if mean is None else round(mean * 1000, 2)
+
+
+def _get_load(coordinator: FoxtrotPLCCoordinator) -> float | None:
+    """Return the share of the update interval spent polling, in percent."""
+    load = (
+        coordinator.scheduler.load(coordinator)
+        if coordinator.scheduler
+        else None
+    )
+    if not load or load["duty_cycle"] is None:
+        return None
+    return round(load["duty_cycle"] * 100, 2)
+
+
+METRIC_SENSORS = (
+    FoxtrotPLCMetricDescription(
+        key="refresh_duration",
+        name="Refresh duration",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: (
+            None
+            if coordinator.refresh_metrics.last_duration is None
+            else round(coordinator.refresh_metrics.last_duration * 1000, 1)
+        ),
+    ),
+    FoxtrotPLCMetricDescription(
+        key="scan_interval",
+        name="Scan interval",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: (
+            round(coordinator.update_interval.total_seconds(), 1)
+            if coordinator.update_interval
+            else None
+        ),
+    ),
+    FoxtrotPLCMetricDescription(
+        key="variables_per_refresh",
+        name="Variables per refresh",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: (
+            coordinator.refresh_metrics.last_variables
+        ),
+    ),
+    FoxtrotPLCMetricDescription(
+        key="bytes_per_refresh",
+        name="Bytes per refresh",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: coordinator.refresh_metrics.last_bytes,
+    ),
+    FoxtrotPLCMetricDescription(
+        key="get_latency",
+        name="GET round trip",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_get_latency,
+    ),
+    FoxtrotPLCMetricDescription(
+        key="poll_load",
+        name="Poll load",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_get_load,
+    ),
+    FoxtrotPLCMetricDescription(
+        key="timeouts",
+        name="Timeouts",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.client.metrics.timeouts,
+    ),
+    FoxtrotPLCMetricDescription(
+        key="reconnects",
+        name="Reconnects",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.client.metrics.reconnects,
+    ),
+    FoxtrotPLCMetricDescription(
+        key="quarantined_variables",
+        name="Quarantined variables",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: len(
+            coordinator.client.quarantine.quarantined
+        ),
+    ),
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -31,82 +141,86 @@ async def async_setup_entry(
 ) -> None:
     """Set up sensors for Foxtrot PLC."""
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
-    entities = []
-    for variable, value in coordinator.data.items():
-        _LOGGER.debug(f"Creating entity for variable: {variable} with value: {value}")
-        entities.append(FoxtrotPLCSensor(coordinator, variable))
-    _LOGGER.info(f"Adding {len(entities)} entities to Home Assistant")
-    async_add_entities(entities)
-
-class FoxtrotPLCSensor(CoordinatorEntity, SensorEntity):
+    async_add_entities(
+        FoxtrotPLCMetricSensor(coordinator, description)
+        for description in METRIC_SENSORS
+    )
+    async_setup_variable_entities(
+        hass, config_entry, Platform.SENSOR, FoxtrotPLCSensor
+    )
+
+
+class FoxtrotPLCSensor(FoxtrotPLCEntity, SensorEntity):
     """Representation of a Foxtrot PLC sensor."""
 
+    # The window summary of aggregated variables changes with every state
+    _unrecorded_attributes = frozenset(
+        {"mean", "min", "max", "last", "samples"}
+    )
+
     def __init__(
         self, coordinator: FoxtrotPLCCoordinator, variable: str
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._variable = variable
-        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_{variable}"
-        self._attr_name = f"Foxtrot PLC {variable}"
-
-        # Set default values
-        self._attr_state_class = None
-        self._attr_device_class = None
-        self._attr_native_unit_of_measurement = None
-        self._is_temperature = False
-
-        # Determine sensor type and unit based on variable name
-        lower_var = variable.lower()
-        if "temp" in lower_var or "teploty" in lower_var:
-            self._attr_device_class = SensorDeviceClass.TEMPERATURE
-            self._attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
-            self._is_temperature = True
-            if self._is_numeric(coordinator.data.get(variable)):
-                self._attr_state_class = SensorStateClass.MEASUREMENT
-        elif "humidity" in lower_var or "vlhkost" in lower_var:
-            if self._is_numeric(coordinator.data.get(variable)):
-                self._attr_device_class = SensorDeviceClass.HUMIDITY
-                self._attr_native_unit_of_measurement = PERCENTAGE
-                self._attr_state_class = SensorStateClass.MEASUREMENT
-        elif "power" in lower_var or "vykon" in lower_var:
-            if self._is_numeric(coordinator.data.get(variable)):
-                self._attr_device_class = SensorDeviceClass.POWER
-                self._attr_native_unit_of_measurement = UnitOfPower.WATT
-                self._attr_state_class = SensorStateClass.MEASUREMENT
-        elif "energy" in lower_var or "energie" in lower_var:
-            if self._is_numeric(coordinator.data.get(variable)):
-                self._attr_device_class = SensorDeviceClass.ENERGY
-                self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
-                self._attr_state_class = SensorStateClass.TOTAL_INCREASING
-
-    @staticmethod
-    def _is_numeric(value: Any) -> bool:
-        """Check if the value is numeric."""
-        try:
-            float(value)
-            return True
-        except (ValueError, TypeError):
-            return False
+        super().__init__(coordinator, variable)
+        self._metadata = coordinator.get_metadata(variable)
+        self._attr_device_class = self._metadata.device_class
 
     @property
     def native_value(self) -> Any:
         """Return the state of the sensor."""
-        value = self.coordinator.data.get(self._variable)
-        if self._is_numeric(value):
+        value = self._value
+        if value is None:
+            return None
+        try:
+            # States stay floats, "5.0" rather than "5", like recorded ones
             return round(float(value), 2)
-        return value
+        except (TypeError, ValueError):
+            return value
 
     @property
     def state_class(self) -> SensorStateClass | None:
         """Return the state class of the sensor."""
-        if self._is_numeric(self.coordinator.data.get(self._variable)):
-            return self._attr_state_class
-        return None
+        return self._metadata.state_class
 
     @property
     def native_unit_of_measurement(self) -> str | None:
         """Return the unit of measurement of the sensor."""
-        if self._is_temperature:
-            return UnitOfTemperature.CELSIUS
-        return self._attr_native_unit_of_measurement if self._is_numeric(self.coordinator.data.get(self._variable)) else None
\ No newline at end of file
+        return self._metadata.unit
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the summary of the window behind an aggregated value."""
+        return self.coordinator.get_aggregate_attributes(self._variable)
+
+
+class FoxtrotPLCMetricSensor(
+    CoordinatorEntity[FoxtrotPLCCoordinator], SensorEntity
+):
+    """Diagnostic sensor showing a connection or refresh metric."""
+
+    entity_description: FoxtrotPLCMetricDescription
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self,
+        coordinator: FoxtrotPLCCoordinator,
+        description: FoxtrotPLCMetricDescription,
+    ) -> None:
+        """Initialize the metric sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = (
+            f"{coordinator.config_entry.entry_id}_metric_{description.key}"
+        )
+        self._attr_name = f"Foxtrot PLC {description.name}"
+
+    @property
+    def available(self) -> bool:
+        """Return True, metrics are most useful while the PLC is failing."""
+        return True
+
+    @property
+    def native_value(self) -> Any:
+        """Return the metric value."""
+        return self.entity_description.value_fn(self.coordinator)
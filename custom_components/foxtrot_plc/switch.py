@@ -0,0 +1,47 @@
+"""Switch platform for Foxtrot PLC."""
+
+from typing import Any
+
+from homeassistant.components.switch import SwitchEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .coordinator import FoxtrotPLCCoordinator
+from .entity import FoxtrotPLCEntity, async_setup_variable_entities
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up switches for writable BOOL variables."""
+    async_setup_variable_entities(
+        hass, config_entry, Platform.SWITCH, FoxtrotPLCSwitch
+    )
+
+
+class FoxtrotPLCSwitch(FoxtrotPLCEntity, SwitchEntity):
+    """Representation of a writable Foxtrot PLC BOOL variable."""
+
+    def __init__(
+        self, coordinator: FoxtrotPLCCoordinator, variable: str
+    ) -> None:
+        """Initialize the switch."""
+        super().__init__(coordinator, variable)
+
+    @property
+    def is_on(self):
+        """Return true if the variable is set."""
+        value = self._value
+        return None if value is None else bool(value)
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        """Set the variable."""
+        await self.coordinator.async_set_variables({self._variable: True})
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        """Clear the variable."""
+        await self.coordinator.async_set_variables({self._variable: False})
@@ -0,0 +1,263 @@
+"""Protocol trace of the raw bytes exchanged with PLCComS."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import heapq
+import json
+import logging
+import time
+from collections import deque
+
+from .const import RECORDING_FLUSH_SIZE, TRACE_CAPACITY
+
+_LOGGER = logging.getLogger(__name__)
+
+TRACE_FORMAT = "foxtrot_plc_trace"
+TRACE_VERSION = 1
+
+SENT = 0
+RECEIVED = 1
+_DIRECTIONS = ("tx", "rx")
+
+
+class ProtocolTrace:
+    """Bounded ring of the raw commands and responses of one connection.
+
+    Recording keeps a reference to the bytes already written to or read
+    from the socket together with a monotonic timestamp, so it costs one
+    tuple per socket write or read chunk. The oldest entries are dropped
+    once the payloads exceed the capacity in bytes. Nothing is decoded or
+    formatted until the trace is dumped.
+    """
+
+    __slots__ = ("capacity", "_entries", "_size", "dropped")
+
+    def __init__(self, capacity: int = TRACE_CAPACITY) -> None:
+        """Initialize an empty trace."""
+        self.capacity = capacity
+        self._entries = deque()
+        self._size = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        """Return the number of recorded entries."""
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """Return the number of recorded payload bytes."""
+        return self._size
+
+    def record(self, direction: int, data: bytes) -> None:
+        """Record bytes sent to or received from the PLC."""
+        entries = self._entries
+        entries.append((time.monotonic(), direction, data))
+        self._size += len(data)
+        # Always keep the newest entry, even if it alone exceeds the capacity
+        while self._size > self.capacity and len(entries) > 1:
+            self._size -= len(entries.popleft()[2])
+            self.dropped += 1
+
+    def entries(self) -> list[tuple[float, int, bytes]]:
+        """Return a snapshot of the (timestamp, direction, data) entries."""
+        return list(self._entries)
+
+    def clear(self) -> None:
+        """Forget all entries."""
+        self._entries.clear()
+        self._size = 0
+
+
+def _open(path: str, mode: str):
+    """Open a trace file as text, gzip-compressed if its name ends in .gz."""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _header_line(header: dict | None) -> str:
+    """Return the first line of a trace file."""
+    return (
+        json.dumps(
+            {
+                "format": TRACE_FORMAT,
+                "version": TRACE_VERSION,
+                **(header or {}),
+            }
+        )
+        + "\n"
+    )
+
+
+def _entry_line(t: float, connection: int, direction: int, data: bytes) -> str:
+    """Return the line of one trace entry."""
+    return (
+        json.dumps(
+            {
+                "t": round(t, 6),
+                "conn": connection,
+                "dir": _DIRECTIONS[direction],
+                "data": data.decode("utf-8", "surrogateescape"),
+            }
+        )
+        + "\n"
+    )
+
+
+def write_trace(path: str, traces, header: dict | None = None) -> int:
+    """Write traces of one or more connections to a JSON Lines file.
+
+    The first line describes the capture, every further line is one
+    socket write or read with its time relative to the first entry, the
+    connection index, the direction and the bytes as text. Names ending
+    in .gz are compressed. Returns the number of entries written.
+    """
+    merged = heapq.merge(
+        *(
+            [
+                (timestamp, connection, direction, data)
+                for timestamp, direction, data in trace.entries()
+            ]
+            for connection, trace in enumerate(traces)
+        )
+    )
+    count = 0
+    with _open(path, "w") as file:
+        file.write(_header_line(header))
+        start = None
+        for timestamp, connection, direction, data in merged:
+            if start is None:
+                start = timestamp
+            file.write(
+                _entry_line(timestamp - start, connection, direction, data)
+            )
+            count += 1
+    return count
+
+
+def read_trace(path: str) -> tuple[dict, list[tuple[float, int, int, bytes]]]:
+    """Read a trace file back as its header and (t, conn, dir, data) tuples."""
+    with _open(path, "r") as file:
+        header = json.loads(file.readline())
+        if header.get("format") != TRACE_FORMAT:
+            raise ValueError(f"{path} is not a Foxtrot PLC trace")
+        entries = []
+        for line in file:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            entries.append(
+                (
+                    entry["t"],
+                    entry["conn"],
+                    _DIRECTIONS.index(entry["dir"]),
+                    entry["data"].encode("utf-8", "surrogateescape"),
+                )
+            )
+    return header, entries
+
+
+class _RecorderChannel:
+    """Records the traffic of one connection into a TraceRecorder."""
+
+    __slots__ = ("_recorder", "_connection")
+
+    def __init__(self, recorder: TraceRecorder, connection: int) -> None:
+        """Initialize the channel."""
+        self._recorder = recorder
+        self._connection = connection
+
+    def record(self, direction: int, data: bytes) -> None:
+        """Record bytes sent to or received from the PLC."""
+        self._recorder.record(self._connection, direction, data)
+
+
+class TraceRecorder:
+    """Capture of a whole session, streamed to a trace file.
+
+    Unlike ProtocolTrace nothing is dropped. Entries are collected in
+    memory and written in the executor whenever RECORDING_FLUSH_SIZE
+    bytes have built up, one write at a time so the file stays in order.
+    The file has the same format as a dumped trace.
+    """
+
+    def __init__(self, path: str, header: dict | None = None) -> None:
+        """Initialize the recorder, async_start() opens the file."""
+        self.path = path
+        self.entries = 0
+        self.size = 0
+        self._header = {"started": time.time(), **(header or {})}
+        self._start = time.monotonic()
+        self._file = None
+        self._pending = []
+        self._pending_size = 0
+        self._writing = None
+
+    def channel(self, connection: int) -> _RecorderChannel:
+        """Return the recording sink of one connection."""
+        return _RecorderChannel(self, connection)
+
+    async def async_start(self) -> None:
+        """Create the file and write its header."""
+        self._start = time.monotonic()
+        self._file = await asyncio.get_running_loop().run_in_executor(
+            None, self._create
+        )
+
+    def _create(self):
+        """Create the file, in the executor."""
+        file = _open(self.path, "w")
+        file.write(_header_line(self._header))
+        return file
+
+    def record(self, connection: int, direction: int, data: bytes) -> None:
+        """Record bytes sent to or received from the PLC."""
+        self._pending.append((time.monotonic(), connection, direction, data))
+        self._pending_size += len(data)
+        self.entries += 1
+        self.size += len(data)
+        if (
+            self._pending_size >= RECORDING_FLUSH_SIZE
+            and self._writing is None
+        ):
+            self._flush()
+
+    def _flush(self) -> None:
+        """Hand the collected entries to the executor."""
+        if self._file is None or not self._pending:
+            return
+        pending, self._pending, self._pending_size = self._pending, [], 0
+        self._writing = asyncio.get_running_loop().run_in_executor(
+            None, self._write, pending
+        )
+        self._writing.add_done_callback(self._written)
+
+    def _written(self, future: asyncio.Future) -> None:
+        """Start the next write if enough has been collected meanwhile."""
+        self._writing = None
+        if not future.cancelled() and (err := future.exception()) is not None:
+            _LOGGER.error(f"Error writing recording {self.path}: {err}")
+        if self._pending_size >= RECORDING_FLUSH_SIZE:
+            self._flush()
+
+    def _write(self, entries) -> None:
+        """Write entries to the file, in the executor."""
+        start = self._start
+        self._file.writelines(
+            _entry_line(timestamp - start, connection, direction, data)
+            for timestamp, connection, direction, data in entries
+        )
+
+    async def async_stop(self) -> None:
+        """Write the remaining entries and close the file."""
+        if self._file is None:
+            self._pending = []
+            return
+        while self._writing is not None or self._pending:
+            if self._writing is None:
+                self._flush()
+            await asyncio.wait([self._writing])
+        file, self._file = self._file, None
+        await asyncio.get_running_loop().run_in_executor(None, file.close)
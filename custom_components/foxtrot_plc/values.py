@@ -0,0 +1,195 @@
+"""Slot-indexed store for the published PLC values."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator, Mapping
+
+# Kind of the value held by a slot
+_ABSENT = 0
+_BOOL = 1
+_INT = 2
+_FLOAT = 3
+_OBJECT = 4  # Strings, and integers too large for the int64 buffer
+_KINDS = {bool: _BOOL, int: _INT, float: _FLOAT}
+
+
+class ValueStore(Mapping):
+    """Published values, one fixed slot per variable.
+
+    A variable keeps its slot for the lifetime of the store, so entities
+    resolve their slot once and read by index. Booleans and integers live
+    in an int64 array, reals in a double array and everything else in a
+    side table, next to a byte per slot telling which one holds the value.
+    Refreshes update the slots in place and the changed slots are
+    collected until the listeners are notified.
+
+    The store is a read-only Mapping of variable name to value, so it can
+    stand in for the dict the coordinator used to publish.
+
+    It holds more memory than that dict and reads are slower, see
+    benchmarks/bench_value_store.py. What it saves is the allocation of
+    a new dict of boxed values on every refresh: a refresh changing a few
+    percent of 10000 values peaks at about 15 KiB instead of 370 KiB, and
+    the changed slots it collects are what limits listener updates to the
+    entities whose value changed.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty store."""
+        self._slots = {}
+        self._names = []
+        self._kinds = bytearray()
+        self._integers = array("q")
+        self._floats = array("d")
+        self._objects = []
+        self._count = 0
+        self._dirty = bytearray()
+        self._changed = []
+
+    def slot(self, name: str) -> int:
+        """Return the slot of a variable, assigning a new one if needed."""
+        slot = self._slots.get(name)
+        if slot is None:
+            slot = self._slots[name] = len(self._names)
+            self._names.append(name)
+            self._kinds.append(_ABSENT)
+            self._integers.append(0)
+            self._floats.append(0.0)
+            self._objects.append(None)
+            self._dirty.append(0)
+        return slot
+
+    def assign(self, names) -> None:
+        """Give every variable a slot, e.g. when the catalog loads."""
+        for name in names:
+            self.slot(name)
+
+    def retain(self, names) -> None:
+        """Clear the values of all variables not in names."""
+        keep = {self._slots[name] for name in names if name in self._slots}
+        for slot, kind in enumerate(self._kinds):
+            if kind != _ABSENT and slot not in keep:
+                self.clear_slot(slot)
+
+    def value_at(self, slot: int):
+        """Return the value held by a slot, None if it has none."""
+        kind = self._kinds[slot]
+        if kind == _FLOAT:
+            return self._floats[slot]
+        if kind == _INT:
+            return self._integers[slot]
+        if kind == _BOOL:
+            return self._integers[slot] == 1
+        if kind == _OBJECT:
+            return self._objects[slot]
+        return None
+
+    def set(self, name: str, value) -> bool:
+        """Store a value, return True if it changed."""
+        slot = self._slots.get(name)
+        if slot is None:
+            slot = self.slot(name)
+        return self.set_slot(slot, value)
+
+    def set_slot(self, slot: int, value) -> bool:
+        """Store a value in a slot, return True if it changed."""
+        kinds = self._kinds
+        previous = kinds[slot]
+        kind = _KINDS.get(type(value), _OBJECT)
+        if kind == _FLOAT:
+            if previous == _FLOAT and self._floats[slot] == value:
+                return False
+            self._floats[slot] = value
+        elif kind != _OBJECT:
+            if previous == kind and self._integers[slot] == value:
+                return False
+            kind = self._set_integer(slot, kind, value)
+        if kind == _OBJECT:
+            if previous == _OBJECT and self._objects[slot] == value:
+                return False
+            self._objects[slot] = value
+        elif previous == _OBJECT:
+            self._objects[slot] = None  # Not kept alive by a number slot
+        if previous == _ABSENT:
+            self._count += 1
+        kinds[slot] = kind
+        self._mark(slot)
+        return True
+
+    def _set_integer(self, slot: int, kind: int, value: int) -> int:
+        """Put an integer into the int64 buffer, return the kind it got.
+
+        Integers that do not fit go to the side table instead.
+        """
+        try:
+            self._integers[slot] = value
+        except OverflowError:
+            return _OBJECT
+        return kind
+
+    def discard(self, name: str) -> bool:
+        """Clear the value of a variable, return True if it had one."""
+        slot = self._slots.get(name)
+        return slot is not None and self.clear_slot(slot)
+
+    def clear_slot(self, slot: int) -> bool:
+        """Clear the value of a slot, return True if it had one."""
+        if self._kinds[slot] == _ABSENT:
+            return False
+        self._kinds[slot] = _ABSENT
+        self._objects[slot] = None
+        self._count -= 1
+        self._mark(slot)
+        return True
+
+    def _mark(self, slot: int) -> None:
+        """Remember a changed slot until the next pop_changed()."""
+        if not self._dirty[slot]:
+            self._dirty[slot] = 1
+            self._changed.append(slot)
+
+    def pop_changed(self) -> list[str]:
+        """Return the variables changed since the last call and forget them."""
+        changed, self._changed = self._changed, []
+        dirty = self._dirty
+        names = self._names
+        for slot in changed:
+            dirty[slot] = 0
+        return [names[slot] for slot in changed]
+
+    def __getitem__(self, name: str):
+        """Return the value of a variable."""
+        slot = self._slots.get(name)
+        if slot is None or self._kinds[slot] == _ABSENT:
+            raise KeyError(name)
+        return self.value_at(slot)
+
+    def get(self, name: str, default=None):
+        """Return the value of a variable, default if it has none."""
+        slot = self._slots.get(name)
+        if slot is None or self._kinds[slot] == _ABSENT:
+            return default
+        return self.value_at(slot)
+
+    def __contains__(self, name) -> bool:
+        """Return True if a variable has a value."""
+        slot = self._slots.get(name)
+        return slot is not None and self._kinds[slot] != _ABSENT
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the variables that have a value."""
+        names = self._names
+        return (
+            names[slot]
+            for slot, kind in enumerate(self._kinds)
+            if kind != _ABSENT
+        )
+
+    def __len__(self) -> int:
+        """Return the number of variables with a value."""
+        return self._count
+
+    def __repr__(self) -> str:
+        """Return a readable representation."""
+        return f"ValueStore({dict(self.items())!r})"
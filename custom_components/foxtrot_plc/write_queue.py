@@ -0,0 +1,71 @@
+"""Coalescing write queue for the Foxtrot PLC integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class FoxtrotPLCWriteQueue:
+    """Collect writes for a short window and send them as one batch.
+
+    Repeated writes to the same variable within the window are coalesced,
+    so only the last value is sent, and the remaining SET: commands go out
+    in a single pipelined write.
+    """
+
+    def __init__(self, hass: HomeAssistant, client, debounce: float) -> None:
+        """Initialize the write queue."""
+        self.hass = hass
+        self.client = client
+        self.debounce = debounce
+        self._pending: dict[str, str] = {}
+        self._waiters: list[asyncio.Future] = []
+        self._flush_handle = None
+
+    async def async_write(self, values: dict[str, str]) -> None:
+        """Queue encoded values and wait until they were sent."""
+        self._pending.update(values)
+        future = self.hass.loop.create_future()
+        self._waiters.append(future)
+        if self._flush_handle is None:
+            self._flush_handle = self.hass.loop.call_later(
+                self.debounce, self._start_flush
+            )
+        await future
+
+    @callback
+    def _start_flush(self) -> None:
+        """Send the queued values once the window closes."""
+        self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        waiters, self._waiters = self._waiters, []
+        self.hass.async_create_task(self._async_flush(pending, waiters))
+
+    async def _async_flush(self, pending, waiters) -> None:
+        """Write a batch and resolve everyone waiting on it."""
+        try:
+            await self.client.set_variables(pending)
+            _LOGGER.debug("Wrote %d variables to the PLC", len(pending))
+        except Exception as err:
+            _LOGGER.error(f"Error writing {len(pending)} variables: {err}")
+            for future in waiters:
+                if not future.done():
+                    future.set_exception(err)
+            return
+        for future in waiters:
+            if not future.done():
+                future.set_result(None)
+
+    async def async_shutdown(self) -> None:
+        """Send anything still queued."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+            pending, self._pending = self._pending, {}
+            waiters, self._waiters = self._waiters, []
+            await self._async_flush(pending, waiters)
@@ -0,0 +1,11 @@
+"""Shared setup for the Foxtrot PLC tests."""
+
+import sys
+from pathlib import Path
+
+# The tests drive the client against the benchmarks' PLCComS simulator
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+from _common import load_integration  # noqa: E402
+
+load_integration()
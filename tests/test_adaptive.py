@@ -0,0 +1,35 @@
+"""Tests of the adaptive poll interval."""
+
+from foxtrot_plc.adaptive import AdaptiveInterval
+
+
+def test_busy_group_speeds_up_to_the_minimum():
+    """Many changed values halve the interval down to its lower bound."""
+    adaptive = AdaptiveInterval(40, 5, 300)
+    assert adaptive.observe(50, 100, 0.1) == 20
+    for _ in range(5):
+        adaptive.observe(50, 100, 0.1)
+    assert adaptive.interval == 5
+
+
+def test_idle_group_slows_down_to_the_maximum():
+    """Values that sit still grow the interval up to its upper bound."""
+    adaptive = AdaptiveInterval(40, 5, 60)
+    assert adaptive.observe(0, 100, 0.1) == 50
+    for _ in range(5):
+        adaptive.observe(0, 100, 0.1)
+    assert adaptive.interval == 60
+
+
+def test_overrun_backs_off():
+    """A refresh taking over half the interval backs it off."""
+    adaptive = AdaptiveInterval(10, 5, 300)
+    assert adaptive.observe(50, 100, 8) == 20
+    assert adaptive.overruns == 1
+
+
+def test_empty_poll_keeps_the_interval():
+    """A poll of nothing leaves the interval alone."""
+    adaptive = AdaptiveInterval(10, 5, 300)
+    assert adaptive.observe(0, 0, 0.1) == 10
+    assert adaptive.change_rate is None
@@ -0,0 +1,71 @@
+"""Tests of the windowed aggregation."""
+
+from foxtrot_plc.aggregation import WindowAggregate
+
+
+def test_first_sample_is_published():
+    """The first sample gives the entity a state right away."""
+    aggregate = WindowAggregate("mean", 10, 16)
+    assert aggregate.add(4.0, 100.0) == 4.0
+    assert aggregate.window_end == 110.0
+    assert not aggregate.pending
+
+
+def test_window_closes_with_the_next_sample():
+    """The sample after the window end starts the next window."""
+    aggregate = WindowAggregate("mean", 10, 16)
+    aggregate.add(0.0, 100.0)
+    assert aggregate.add(2.0, 102.0) is None
+    assert aggregate.add(4.0, 109.9) is None
+    assert aggregate.add(100.0, 110.0) == 3.0
+    assert aggregate.summary == {
+        "mean": 3.0,
+        "min": 2.0,
+        "max": 4.0,
+        "last": 4.0,
+        "samples": 2,
+    }
+    assert aggregate.window_end == 120.0
+    assert aggregate.pending
+    assert aggregate.add(200.0, 121.0) == 100.0
+
+
+def test_flush_closes_an_ended_window():
+    """A window without further samples is published by flush()."""
+    aggregate = WindowAggregate("max", 10, 16)
+    aggregate.add(1, 100.0)
+    aggregate.add(5, 101.0)
+    aggregate.add(3, 102.0)
+    assert aggregate.flush(109.0) is None
+    assert aggregate.flush(110.0) == 5
+    assert not aggregate.pending
+    assert aggregate.flush(200.0) is None
+
+
+def test_empty_window_publishes_nothing():
+    """A window that ends without samples is skipped, not published."""
+    aggregate = WindowAggregate("mean", 10, 16)
+    aggregate.add(1.0, 100.0)
+    assert aggregate.add(7.0, 135.0) is None
+    assert aggregate.window_end == 145.0
+    assert aggregate.flush(145.0) == 7.0
+
+
+def test_integer_samples_keep_their_type():
+    """Statistics of integer variables other than the mean stay integers."""
+    aggregate = WindowAggregate("min", 10, 16)
+    aggregate.add(3, 100.0)
+    aggregate.add(2, 101.0)
+    result = aggregate.flush(110.0)
+    assert result == 2 and isinstance(result, int)
+    assert isinstance(aggregate.summary["last"], int)
+
+
+def test_full_ring_keeps_the_newest_samples():
+    """Statistics cover the newest samples, the count covers them all."""
+    aggregate = WindowAggregate("mean", 10, 4)
+    aggregate.add(0.0, 100.0)
+    for index, value in enumerate((100.0, 100.0, 1.0, 2.0, 3.0, 4.0)):
+        aggregate.add(value, 101.0 + index)
+    assert aggregate.flush(110.0) == 2.5
+    assert aggregate.summary["samples"] == 6
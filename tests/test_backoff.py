@@ -0,0 +1,42 @@
+"""Tests of the reconnect back-off and the variable quarantine."""
+
+import random
+
+from foxtrot_plc.backoff import Backoff, VariableQuarantine
+
+
+def test_backoff_doubles_up_to_the_maximum():
+    """Each failure doubles the delay, with jitter over its upper half."""
+    backoff = Backoff(1, 8, random.Random(0))
+    for bound in (1, 2, 4, 8, 8):
+        delay = backoff.failure(now=0.0)
+        assert bound / 2 <= delay <= bound
+    assert backoff.remaining(now=0.0) == delay
+    backoff.success()
+    assert backoff.remaining(now=0.0) == 0.0
+
+
+def test_quarantine_after_repeated_failures():
+    """A variable is held back once it fails threshold times in a row."""
+    quarantine = VariableQuarantine(threshold=3)
+    assert quarantine.failed("A", "error") is None
+    assert quarantine.failed("A", "error") is None
+    assert quarantine.failed("A", "error") is not None
+    assert quarantine.quarantined == ["A"]
+    assert quarantine.due(["A", "B"]) == ["B"]
+
+
+def test_timeout_quarantines_immediately():
+    """A read that timed out quarantines its variable at once."""
+    quarantine = VariableQuarantine(threshold=3)
+    assert quarantine.failed("A", "timeout", immediate=True) is not None
+    assert quarantine.due(["A"]) == []
+
+
+def test_success_releases_the_variable():
+    """The first successful read forgets the failures."""
+    quarantine = VariableQuarantine(threshold=1)
+    quarantine.failed("A", "error")
+    quarantine.succeeded("A")
+    assert "A" not in quarantine
+    assert quarantine.due(["A"]) == ["A"]
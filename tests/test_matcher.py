@@ -0,0 +1,40 @@
+"""Tests of the variable name matching."""
+
+from foxtrot_plc.matcher import (
+    PrefixMatcher,
+    VariableFilter,
+    parse_prefix_settings,
+)
+
+
+def test_match_prefers_the_longest_prefix():
+    """A longer prefix is not shadowed by a shorter one it starts with."""
+    matcher = PrefixMatcher(["MAIN.T", "MAIN.TEMP"])
+    assert matcher.match("main.temp.room") == "MAIN.TEMP"
+    assert matcher.match("MAIN.TIME") == "MAIN.T"
+    assert matcher.match("OTHER") is None
+
+
+def test_empty_matcher_matches_nothing():
+    """Without prefixes nothing matches."""
+    matcher = PrefixMatcher([])
+    assert not matcher
+    assert not matcher.matches("MAIN.X")
+    assert matcher.match("MAIN.X") is None
+
+
+def test_filter_includes_and_excludes():
+    """Variables must match an include and no exclude prefix."""
+    variables = ["A.X", "A.Y", "B.X"]
+    assert VariableFilter([], []).filter(variables) == variables
+    assert VariableFilter(["A."], []).filter(variables) == ["A.X", "A.Y"]
+    assert VariableFilter([], [".X"]).filter(variables) == ["A.Y"]
+    assert VariableFilter(["A."], [".Y"]).filter(variables) == ["A.X"]
+
+
+def test_parse_prefix_settings_skips_incomplete_entries():
+    """Entries without a prefix or a value are left out."""
+    assert parse_prefix_settings(" A = 1, B=, =2, C=3% ") == {
+        "A": "1",
+        "C": "3%",
+    }
@@ -0,0 +1,29 @@
+"""Tests of the PLCComS response parser."""
+
+from foxtrot_plc.parser import ResponseParser, format_record
+
+
+def test_records_split_across_chunks():
+    """A line split over two chunks is only parsed once it is complete."""
+    parser = ResponseParser()
+    assert list(parser.feed(b"GET:A,1\nDIFF:B,2")) == [("GET", "A", "1")]
+    assert len(parser) == len(b"DIFF:B,2")
+    assert list(parser.feed(b".5\r\n")) == [("DIFF", "B", "2.5")]
+    assert len(parser) == 0
+
+
+def test_records_without_value_or_keyword():
+    """The end of a LIST: has no value, a bare line has no keyword."""
+    parser = ResponseParser()
+    assert list(parser.feed(b"LIST:\n\nhello\nGET:A,\n")) == [
+        ("LIST", "", None),
+        ("", "hello", None),
+        ("GET", "A", ""),
+    ]
+
+
+def test_format_record_restores_the_line():
+    """A parsed record formats back to the line it came from."""
+    for line in ("GET:A,1", "LIST:", "ERROR:GET A", "hello", "GET:A,"):
+        (record,) = ResponseParser().feed(f"{line}\n".encode())
+        assert format_record(*record) == line
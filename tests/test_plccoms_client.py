@@ -0,0 +1,95 @@
+"""Tests of the PLCComS client response matching."""
+
+import asyncio
+
+from foxtrot_plc.plccoms_client import PLCComsClient
+from plccoms_simulator import PLCComsSimulator
+
+VARIABLES = 200
+
+
+class _InjectingSimulator(PLCComsSimulator):
+    """Simulator that sends an extra line before answering one GET:."""
+
+    def __init__(self, variable: str, line: str) -> None:
+        super().__init__(VARIABLES)
+        self.inject_before = variable
+        self.inject_line = line
+
+    def _handle_command(self, writer, command: str) -> None:
+        if command == f"GET:{self.inject_before}":
+            self._send(writer, self.inject_line)
+        super()._handle_command(writer, command)
+
+
+async def _poll_rounds(line: str, rounds: int = 3):
+    """Poll every variable with a line injected mid-window, per round."""
+    probe = PLCComsSimulator(VARIABLES)
+    names = list(probe.values)
+    simulator = _InjectingSimulator(names[VARIABLES // 2], line)
+    port = await simulator.start()
+    client = PLCComsClient("127.0.0.1", port, batch_size=VARIABLES)
+    try:
+        results = [await client.get_variables(names) for _ in range(rounds)]
+    finally:
+        await client.disconnect()
+        await simulator.stop()
+    return names, results, client
+
+
+def test_set_error_in_get_window():
+    """A rejected SET: in the middle of a GET: window costs no values."""
+    names, results, client = asyncio.run(
+        _poll_rounds("ERROR:SET NO.SUCH.VARIABLE\n")
+    )
+    for values in results:
+        assert sorted(values) == sorted(names)
+    assert len(client.quarantine) == 0
+    assert client.metrics.command("SET").errors == 3
+    assert client.metrics.reconnects == 0
+
+
+def test_stray_get_response_in_get_window():
+    """A GET: response for a variable nobody asked for is ignored."""
+    names, results, client = asyncio.run(
+        _poll_rounds("GET:NO.SUCH.VARIABLE,1\n")
+    )
+    for values in results:
+        assert sorted(values) == sorted(names)
+    assert len(client.quarantine) == 0
+
+
+class _SilentSimulator(PLCComsSimulator):
+    """Simulator that never answers the GET: of one variable."""
+
+    def __init__(self, variable: str) -> None:
+        super().__init__(VARIABLES)
+        self.silent = variable
+
+    def _handle_command(self, writer, command: str) -> None:
+        if command != f"GET:{self.silent}":
+            super()._handle_command(writer, command)
+
+
+async def _list_after_timeout():
+    """List the catalog after a GET: window timed out on its last variable."""
+    probe = PLCComsSimulator(VARIABLES)
+    names = list(probe.values)
+    simulator = _SilentSimulator(names[-1])
+    port = await simulator.start()
+    client = PLCComsClient("127.0.0.1", port, batch_size=VARIABLES)
+    client.command_timeout = 0.2
+    try:
+        values = await client.get_variables(names)
+        catalog = await client.list_variables()
+    finally:
+        await client.disconnect()
+        await simulator.stop()
+    return names, values, catalog
+
+
+def test_abandoned_get_does_not_take_list_response():
+    """An unanswered GET: given up earlier leaves the next LIST: intact."""
+    names, values, catalog = asyncio.run(_list_after_timeout())
+    assert sorted(values) == sorted(names[:-1])
+    assert list(catalog) == names
@@ -0,0 +1,60 @@
+"""Tests of the slot-indexed value store."""
+
+from foxtrot_plc.values import ValueStore
+
+
+def test_slot_changes_kind():
+    """A slot follows its value from one kind to another."""
+    store = ValueStore()
+    for value in (1, 2.5, "text", True, 0, 7):
+        assert store.set("A", value)
+        assert store.get("A") == value
+        assert type(store.get("A")) is type(value)
+    assert len(store) == 1
+
+
+def test_bool_and_int_are_distinct():
+    """True and 1 are different values, so the change is reported."""
+    store = ValueStore()
+    store.set("A", 1)
+    assert store.set("A", True)
+    assert store["A"] is True
+    assert not store.set("A", True)
+
+
+def test_unchanged_values_are_not_reported():
+    """Setting the same value again is not a change."""
+    store = ValueStore()
+    for value in (3, 3.5, "on"):
+        store.set("A", value)
+        store.pop_changed()
+        assert not store.set("A", value)
+        assert store.pop_changed() == []
+
+
+def test_large_integer_overflows_to_the_side_table():
+    """Integers beyond int64 are kept as they are."""
+    store = ValueStore()
+    big = 2**70
+    assert store.set("A", big)
+    assert store["A"] == big
+    assert not store.set("A", big)
+    assert store.set("A", 5)
+    assert store["A"] == 5
+    assert store._objects[store.slot("A")] is None
+
+
+def test_discard_and_retain():
+    """Cleared values are gone from the mapping and reported changed."""
+    store = ValueStore()
+    store.assign(["A", "B", "C"])
+    store.set("A", 1)
+    store.set("B", "x")
+    store.set("C", 2.0)
+    store.pop_changed()
+    assert store.discard("A")
+    assert not store.discard("A")
+    store.retain(["C"])
+    assert dict(store) == {"C": 2.0}
+    assert sorted(store.pop_changed()) == ["A", "B"]
+    assert "A" not in store and len(store) == 1